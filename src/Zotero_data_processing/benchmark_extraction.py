@@ -0,0 +1,47 @@
+"""Micro-benchmark of the per-article overhead of the datapoints extraction (create_datapoints_df.py).
+
+Compares the rows given to process_article(): pd.Series from iterrows() (before) and ArticleRecord from itertuples() (after).
+Both the cost of building the rows alone and the cost of the full extraction are reported, in µs per article.
+
+    python ./src/Zotero_data_processing/benchmark_extraction.py -i data/Dataframes/all_articles.pkl
+"""
+import argparse
+import timeit
+
+from create_datapoints_df import iter_article_records, process_article
+from utils.dataframes import load_dataframe
+
+
+def iter_series_rows(articlesDf):
+    for _, article in articlesDf.iterrows():
+        yield article
+
+
+def extract_all(articles):
+    for article in articles:
+        process_article(article.name, article)
+
+
+def time_per_article(function, nbArticles, repeat) -> float:
+    """Best time of `repeat` runs of function(), in µs per article."""
+    return min(timeit.repeat(function, number=1, repeat=repeat)) / nbArticles * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark of the per-article overhead of the datapoints extraction.")
+    parser.add_argument("--input", "-i", type=str, required=True, help="Path of the input Dataframe with the articles.")
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="Number of runs, the best one is reported.")
+    args = parser.parse_args()
+
+    articlesDf = load_dataframe(args.input, columns=["Tags", "Date"])
+    nbArticles = len(articlesDf)
+
+    rowsBefore = time_per_article(lambda: list(iter_series_rows(articlesDf)), nbArticles, args.repeat)
+    rowsAfter = time_per_article(lambda: list(iter_article_records(articlesDf)), nbArticles, args.repeat)
+    extractionBefore = time_per_article(lambda: extract_all(iter_series_rows(articlesDf)), nbArticles, args.repeat)
+    extractionAfter = time_per_article(lambda: extract_all(iter_article_records(articlesDf)), nbArticles, args.repeat)
+
+    print(f"{nbArticles} articles, best of {args.repeat} runs, in µs per article:")
+    print(f"{'':<22}{'iterrows (Series)':>20}{'ArticleRecord':>16}{'speedup':>10}")
+    print(f"{'Building the rows':<22}{rowsBefore:>20.1f}{rowsAfter:>16.1f}{rowsBefore / rowsAfter:>9.1f}x")
+    print(f"{'Full extraction':<22}{extractionBefore:>20.1f}{extractionAfter:>16.1f}{extractionBefore / extractionAfter:>9.1f}x")
@@ -0,0 +1,73 @@
+"""Startup benchmark of the command-line entry points, with a budget of import time for each of them.
+
+Each script is run with --help under "python -X importtime", which reports the import time of every module (in µs, on stderr).
+The import time of a run is the sum of the cumulative times of the top-level imports. The heavy packages (pandas, numpy, tqdm, pyzotero, tabulate)
+are deferred until used (see utils/imports.py), so they should not appear. The script exits with 1 if an entry point is over its budget.
+
+    python ./src/Zotero_data_processing/benchmark_startup.py
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget of import time of each entry point with --help, in ms: about twice the import time with deferred imports (60-130 ms),
+# well below that of the heavy packages alone (~500 ms for pandas, ~240 ms for pyzotero, ~80 ms for tqdm)
+ENTRY_POINT_BUDGETS = {
+    "create_articles_df.py": 250,
+    "create_datapoints_df.py": 200,
+    "vectorized_extraction.py": 200,
+    "benchmark_extraction.py": 200,
+}
+
+
+def import_times(script: Path) -> dict[str, float]:
+    """_summary_
+    Runs a script with --help under "python -X importtime".
+
+    Args:
+        script (Path): Path of the script
+
+    Raises:
+        ValueError: If the script fails
+
+    Returns:
+        dict[str, float]: Cumulative import time of each top-level import, in ms
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", str(script), "--help"], capture_output=True, text=True)
+    if process.returncode != 0:
+        raise ValueError(f"{script.name} --help failed:\n{process.stderr}")
+    times = {}
+    for line in process.stderr.splitlines():
+        # "import time: <self [us]> | <cumulative [us]> | <package>", the nested imports are indented
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, package = line.split("|")
+        if not package.startswith("  "):
+            times[package.strip()] = times.get(package.strip(), 0) + int(cumulative) / 1000
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup benchmark of the command-line entry points (import time with --help).")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Number of runs of each entry point, the best one is reported.")
+    parser.add_argument("--top", type=int, default=3, help="Number of heaviest top-level imports printed for each entry point.")
+    args = parser.parse_args()
+
+    scriptsDir = Path(__file__).parent
+    overBudget = []
+    print(f"Import time with --help, best of {args.repeat} runs, in ms:")
+    print(f"{'':<28}{'import time':>12}{'budget':>8}   heaviest imports")
+    for scriptName, budget in ENTRY_POINT_BUDGETS.items():
+        runs = [import_times(scriptsDir / scriptName) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: sum(times.values()))
+        total = sum(best.values())
+        heaviest = ", ".join(f"{package} {time:.0f}" for package, time in sorted(best.items(), key=lambda item: -item[1])[:args.top])
+        print(f"{scriptName:<28}{total:>12.1f}{budget:>8}   {heaviest}")
+        if total > budget:
+            overBudget.append(scriptName)
+
+    if overBudget:
+        print(f"Over budget: {', '.join(overBudget)}.")
+        sys.exit(1)
+    print("All the entry points are within budget.")
@@ -0,0 +1,89 @@
+"""Chunked on-disk store of DataFrame rows, written as they arrive and resumable after a crash.
+
+Each chunk is a pickled DataFrame written atomically (temporary file + rename), and a checkpoint file lists the completed chunks
+with the keys of the rows they contain (and optionally the warnings recorded while producing them, to report them again when they are skipped).
+After a crash, the keys already stored are skipped and the ingestion goes on with new chunks.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+from utils.imports import lazy_import
+
+# Imported on first use, see utils/imports.py
+pd = lazy_import("pandas")
+
+
+class ChunkedStore:
+    """_summary_
+    Directory of pickled DataFrame chunks with a "checkpoint.json" listing the completed chunks and their keys.
+
+    Args:
+        directory (str | Path): Directory of the store (created if needed)
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.checkpointPath = self.directory / "checkpoint.json"
+        if self.checkpointPath.exists():
+            with open(self.checkpointPath) as f:
+                self.chunks = json.load(f)["chunks"]
+        else:
+            self.chunks = []
+
+    def completed_keys(self) -> set[str]:
+        return {key for chunk in self.chunks for key in chunk["keys"]}
+
+    def _write_atomically(self, path: Path, write):
+        tmpPath = path.with_name(path.name + ".tmp")
+        write(tmpPath)
+        os.replace(tmpPath, path)
+
+    def completed_events(self) -> list[tuple]:
+        """The warnings recorded with the completed chunks, see write_chunk()."""
+        return [tuple(event) for chunk in self.chunks for event in chunk.get("events", [])]
+
+    def write_chunk(self, df: pd.DataFrame, keys: list[str], events: Optional[list[tuple]] = None):
+        """_summary_
+        Writes a chunk, then records it in the checkpoint (a chunk is only considered completed once in the checkpoint).
+
+        Args:
+            df (pd.DataFrame): The rows of the chunk
+            keys (list[str]): The keys of the rows
+            events (list[tuple], optional): The warnings recorded while producing the rows (see Diagnostics), saved in the checkpoint. Defaults to None.
+        """
+        fileName = f"chunk_{len(self.chunks):05d}.pkl"
+        self._write_atomically(self.directory / fileName, df.to_pickle)
+        self.chunks.append({"file": fileName, "keys": list(keys)} | ({"events": events} if events is not None else {}))
+
+        def write_checkpoint(path):
+            with open(path, "w") as f:
+                json.dump({"chunks": self.chunks}, f)
+        self._write_atomically(self.checkpointPath, write_checkpoint)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yields the completed chunks one by one, so that only one chunk is in memory at a time."""
+        for chunk in self.chunks:
+            yield pd.read_pickle(self.directory / chunk["file"])
+
+    def load(self, keysColumn: Optional[str] = None, keys: Optional[list[str]] = None) -> pd.DataFrame:
+        """_summary_
+        Concatenates all the chunks in a single DataFrame.
+
+        Args:
+            keysColumn (str, optional): Column holding the keys, used to order the rows. Defaults to None.
+            keys (list[str], optional): If given (with keysColumn), only the rows of these keys are kept, in their order. Defaults to None (all rows, in the order of the chunks).
+
+        Returns:
+            pd.DataFrame: The DataFrame of all the stored rows
+        """
+        df = pd.concat(list(self.iter_chunks()))
+        if keys is not None:
+            df = df[df[keysColumn].isin(keys)]
+            positions = pd.Series(range(len(keys)), index=keys)
+            df = df.iloc[positions.loc[df[keysColumn]].to_numpy().argsort(kind="stable")]
+        return df
@@ -1,64 +1,221 @@
-from pyzotero import zotero
-import pandas as pd
+from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from tqdm import tqdm
 import datetime
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import sys
 import os
+from typing import Iterator, Optional
 
 # Append the parent directory (which contains utils/) to the Python path.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.utils import get_total_in_dict_of_lists, parse_string_to_dict
+from utils.imports import lazy_import
+from utils.utils import parse_string_to_dict
+from utils.dataframes import save_dataframe, load_dataframe
+from zotero_async import AsyncZoteroFetcher, MAX_ITEMS_PER_PAGE
+from zotero_cache import ZoteroItemCache
+from chunked_store import ChunkedStore
+from zotero_local_db import get_all_articles_in_local_collection
 
+# Imported on first use (see utils/imports.py), not for --help; pyzotero and tqdm are imported by the functions using them
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
-def initialize_zotero_API(libraryID: str, libraryType: str) -> zotero.Zotero:
+# The Zotero API accepts at most 50 keys in "itemKey" per request (listing pages hold up to MAX_ITEMS_PER_PAGE = 100 items)
+MAX_ITEMS_PER_REQUEST = 50
+# Search parameter to select only conference papers and journal articles
+ARTICLE_ITEM_TYPES = "conferencePaper || journalArticle || bookSection"
+
+def read_api_key() -> str:
     currentDir = Path(__file__).parent
-    api_key = open(currentDir / ".keys").read().split(":")[1].strip()
-    return zotero.Zotero(libraryID, libraryType, api_key)
+    return open(currentDir / ".keys").read().split(":")[1].strip()
+
+def initialize_zotero_API(libraryID: str, libraryType: str) -> zotero.Zotero:
+    from pyzotero import zotero
+    return zotero.Zotero(libraryID, libraryType, read_api_key())
+
+def get_items_data_through_cache(zoteroAPI: zotero.Zotero, cache: ZoteroItemCache, versions: dict[str, int]) -> list[dict]:
+    """_summary_
+    Get the "data" payloads of the given items, reading the items whose version did not change from the cache.
+    The other items are fetched by batches of keys and stored in the cache.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the items
+        cache (ZoteroItemCache): The cache of item payloads
+        versions (dict[str, int]): The current version of each item, by key (e.g., from a "format=versions" request)
+
+    Returns:
+        list[dict]: The "data" payloads, in the order of versions
+    """
+    itemsData = {}
+    missingKeys = []
+    for key, version in versions.items():
+        data = cache.get(key, version)
+        if data is None:
+            missingKeys.append(key)
+        else:
+            itemsData[key] = data
+
+    from tqdm import tqdm
+    for i in tqdm(range(0, len(missingKeys), MAX_ITEMS_PER_REQUEST)):
+        batch = missingKeys[i:i + MAX_ITEMS_PER_REQUEST]
+        fetchedData = [item["data"] for item in zoteroAPI.items(itemKey=",".join(batch), limit=len(batch))]
+        cache.put(fetchedData)
+        itemsData.update({data["key"]: data for data in fetchedData})
+    print(f"{len(versions) - len(missingKeys)} items read from the cache, {len(missingKeys)} fetched.")
+
+    return [itemsData[key] for key in versions]
+
+def get_all_articles_in_collection(zoteroAPI: zotero.Zotero, collectionKey: str, cache: Optional[ZoteroItemCache] = None) -> list:
+    if cache is not None:
+        # Only list the versions of the items (a single request), unchanged items are then read from the cache
+        versions = zoteroAPI.collection_items(collectionKey, itemType=ARTICLE_ITEM_TYPES, format="versions", limit=None)
+        items = [{"key": data["key"], "version": data["version"], "data": data} for data in get_items_data_through_cache(zoteroAPI, cache, versions)]
+        print(f"{len(items)} items fetched from collection {collectionKey} through the cache ({cache}).")
+        return items
 
-def get_all_articles_in_collection(zoteroAPI: zotero.Zotero, collectionKey: str) -> list:
     # Add search paprameters to select only conference papers and journal articles
     # /!\ Ideally I just want to NOT select notes and attachments, but I did not find the API syntax to do so
-    zoteroAPI.add_parameters(itemType="conferencePaper || journalArticle || bookSection")
+    zoteroAPI.add_parameters(itemType=ARTICLE_ITEM_TYPES)
     # Fetch all the items in the library (Without the limitation of 100 items per request)
     items = zoteroAPI.everything(zoteroAPI.collection_items(collectionKey))
     print(f"{len(items)} items fetched from collection {collectionKey} (name = ).")
     return items
 
-def filter_screened_articles(articlesInCollection: list) -> tuple[list, dict]:
-    exclusionCriteria = {}
-    keysArticlesInSurvey = []
-    for item in tqdm(articlesInCollection):
-        # Print the item's title and type
-        # print(f"{r}{item['data']['itemType']}{e}")
-        # print(f" - {b}{item['data']['title']}{e}")
-        # print(f'Item Type: {item["data"]["itemType"]} | Key: {item["data"]["key"]}')
-
-        tags = item["data"].get("tags", [])
-        isExcluded = False
-        for tag in tags:
-            tag = tag["tag"] # Each Zotero tag is a dictionary with a "tag" key
-            if tag.startswith("Excluded: "):
-                if tag not in exclusionCriteria:
-                    exclusionCriteria[tag] = []
-
-                exclusionCriteria[tag].append(item["data"]["key"])
-                isExcluded = True
-                break
-
-        if not isExcluded:
-            keysArticlesInSurvey.append(item["data"]["key"])
-    return keysArticlesInSurvey, exclusionCriteria
-
-def fetch_articles_data(zoteroAPI: zotero.Zotero, keys: list[str]) -> pd.DataFrame:
+def get_all_articles_in_collection_from_cache(cache: ZoteroItemCache, collectionKey: str) -> list:
+    # Offline version of get_all_articles_in_collection(), the collection membership and item type are read from the cached payloads
+    items = [
+        {"key": data["key"], "version": data["version"], "data": data}
+        for data in cache.all_items_data()
+        if collectionKey in data.get("collections", []) and data.get("itemType") in ARTICLE_ITEM_TYPES.split(" || ")
+        and not data.get("deleted", False)
+    ]
+    print(f"{len(items)} items of collection {collectionKey} read from the cache (offline).")
+    return items
+
+class ExclusionIndex(dict):
+    """_summary_
+    Index of the exclusion criteria of the screening: maps each exclusion tag ("Excluded: <criterion>") to the keys of the items excluded for it,
+    in order of first appearance. Being a dict, it can be used as the former exclusionCriteria dictionary.
+    The per-item exclusions are kept in a Series, so that counts and lookups (e.g., for PRISMA reporting) do not rescan the items.
+
+    Args:
+        exclusions (pd.Series): Exclusion tag of each excluded item, indexed by item key
+    """
+
+    def __init__(self, exclusions: pd.Series):
+        self.exclusions = exclusions
+        grouped = pd.Series(exclusions.index, index=exclusions.to_numpy()).groupby(level=0, sort=False)
+        super().__init__({tag: keys.tolist() for tag, keys in grouped})
+
+    @property
+    def counts(self) -> pd.Series:
+        """Number of excluded items per exclusion tag."""
+        return self.exclusions.value_counts(sort=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.exclusions)
+
+    def criterion_of(self, key: str) -> Optional[str]:
+        """Exclusion tag of an item, or None if it was not excluded."""
+        return self.exclusions.get(key)
+
+def filter_screened_articles(articlesInCollection: list) -> tuple[list, ExclusionIndex]:
+    """_summary_
+    Separate the items selected for the review from the items excluded by the screening, i.e., tagged "Excluded: <criterion>".
+    All the tags are exploded in a single (item, tag) table, and the first exclusion tag of each item is found with vectorized operations on it.
+
+    Args:
+        articlesInCollection (list): Zotero items, as returned by the API (each with a "data" field)
+
+    Returns:
+        tuple[list, ExclusionIndex]: The keys of the items selected for the review, and the index of the exclusion criteria
+    """
+    keys = np.array([item["data"]["key"] for item in articlesInCollection], dtype=object)
+    # Exploded (item, tag) table, as two aligned arrays. Each Zotero tag is a dictionary with a "tag" key
+    tagsPerItem = [item["data"].get("tags", []) for item in articlesInCollection]
+    tagItems = np.repeat(np.arange(len(tagsPerItem)), [len(tags) for tags in tagsPerItem])
+    tags = np.array([tag["tag"] for tags in tagsPerItem for tag in tags], dtype=object)
+
+    # There are far fewer distinct tags than (item, tag) pairs: the prefix is only checked once per distinct tag
+    tagCodes, uniqueTags = pd.factorize(tags)
+    isExclusionTag = np.array([tag.startswith("Excluded: ") for tag in uniqueTags], dtype=bool)[tagCodes]
+
+    # Only the first exclusion tag of an item counts (np.unique returns the index of the first occurrence)
+    exclusionPositions = np.flatnonzero(isExclusionTag)
+    excludedItems, firstExclusion = np.unique(tagItems[exclusionPositions], return_index=True)
+    isExcluded = np.zeros(len(keys), dtype=bool)
+    isExcluded[excludedItems] = True
+
+    exclusions = pd.Series(tags[exclusionPositions[firstExclusion]], index=keys[excludedItems], dtype=object)
+    return keys[~isExcluded].tolist(), ExclusionIndex(exclusions)
+
+def extract_article_data(data: dict) -> dict:
+    """_summary_
+    Extract the title, DOI, URL, abstract, date, item type and citation key, as well the list of authors and tags from the "data" payload of a Zotero item.
+
+    Args:
+        data (dict): The "data" field of a Zotero item, as returned by the API
+
+    Returns:
+        dict: The article's record, i.e., one row of the articles DataFrame
+    """
+    title = data.get("title", "")
+    doi = data.get("DOI", "")
+    url = data.get("url", "")
+    abstractNote = data.get("abstractNote", "")
+    date = data.get("date", "")
+    itemType = data.get("itemType", "")
+    citationKey = data.get("citationKey", "")
+    extra = parse_string_to_dict(data.get("extra", ""))
+
+    # print(f" Extracting \"{extra['Citation Key']}\"...")
+
+    # If KeyError: 'firstName', it's likely Zotero imported the publisher, e.g. "IEEE", as an author.
+    # To solve that, I usually switch it to "Editor" or delete it in Zotero.
+    authorsList = [
+        f"{author['firstName']} {author['lastName']}"
+        for author in data.get("creators", [])
+        if author["creatorType"] == "author"
+    ]
+
+    tags = [tag["tag"] for tag in data.get("tags", [])]
+
+    return {
+        "BBT Citation Key": extra["Citation Key"] if citationKey == "" else citationKey,
+        "Title": title,
+        "List": authorsList,
+        "DOI": doi,
+        "URL": url,
+        "Tags": tags,
+        "Abstract Note": abstractNote,
+        "Date": date,
+        "Item Type": itemType,
+        "Zotero Key": data["key"],
+    }
+
+# Columns of the articles DataFrame, see extract_article_data()
+ARTICLE_COLUMNS = ["BBT Citation Key", "Title", "List", "DOI", "URL", "Tags", "Abstract Note", "Date", "Item Type", "Zotero Key"]
+
+def build_articles_df(articlesData: list[dict]) -> pd.DataFrame:
+    # Without any article (e.g., an incremental sync that only deletes items), the DataFrame still has the columns of the articles
+    df = pd.DataFrame(articlesData, columns=None if articlesData else ARTICLE_COLUMNS)
+    df.set_index("BBT Citation Key", inplace=True)
+    return df
+
+def fetch_articles_data(zoteroAPI: zotero.Zotero, keys: list[str], cache: Optional[ZoteroItemCache] = None) -> pd.DataFrame:
     """_summary_
     Get the title, DOI, URL, abstract, date, item type and citation key, as well the list of authors and tags of each article which key is in the provided list.
 
     Args:
         zoteroAPI (zotero.Zotero): The Zotero API where to get the articles
         keys (list[str]): List of keys of the articles to fetch
+        cache (ZoteroItemCache, optional): If given, only the versions of the articles are requested, and unchanged articles are read from the cache. Defaults to None.
 
     Returns:
         Dataframe: A DataFrame containing each article's: title, DOI, URL, abstract, date, item type and citation key, as well the list of authors and tags
@@ -66,64 +223,356 @@ def fetch_articles_data(zoteroAPI: zotero.Zotero, keys: list[str]) -> pd.DataFra
     articlesData = []
     print(f"Fetching data for {len(keys)} articles...")
 
+    if cache is not None:
+        versions = {}
+        for i in range(0, len(keys), MAX_ITEMS_PER_REQUEST):
+            batch = keys[i:i + MAX_ITEMS_PER_REQUEST]
+            versions.update(zoteroAPI.items(itemKey=",".join(batch), format="versions", limit=None))
+        itemsData = get_items_data_through_cache(zoteroAPI, cache, {key: versions[key] for key in keys})
+        return build_articles_df([extract_article_data(data) for data in itemsData])
+
+    from tqdm import tqdm
     for key in tqdm(keys):
         data = zoteroAPI.item(key)["data"]
+        articlesData.append(extract_article_data(data))
 
-        title = data.get("title", "")
-        doi = data.get("DOI", "")
-        url = data.get("url", "")
-        abstractNote = data.get("abstractNote", "")
-        date = data.get("date", "")
-        itemType = data.get("itemType", "")
-        citationKey = data.get("citationKey", "")
-        extra = parse_string_to_dict(data.get("extra", ""))
-
-        # print(f" Extracting \"{extra['Citation Key']}\"...")
-
-        # If KeyError: 'firstName', it's likely Zotero imported the publisher, e.g. "IEEE", as an author.
-        # To solve that, I usually switch it to "Editor" or delete it in Zotero.
-        authorsList = [
-            f"{author['firstName']} {author['lastName']}"
-            for author in data.get("creators", [])
-            if author["creatorType"] == "author"
-        ]
-
-        tags = [tag["tag"] for tag in data.get("tags", [])]
-
-        articlesData.append(
-            {
-                "BBT Citation Key": extra["Citation Key"] if citationKey == "" else citationKey,
-                "Title": title,
-                "List": authorsList,
-                "DOI": doi,
-                "URL": url,
-                "Tags": tags,
-                "Abstract Note": abstractNote,
-                "Date": date,
-                "Item Type": itemType,
-                "Zotero Key": key,
-            }
-        )
+    return build_articles_df(articlesData)
 
-    df = pd.DataFrame(articlesData)
-    df.set_index("BBT Citation Key", inplace=True)
+def get_all_articles_in_collection_async(fetcher: AsyncZoteroFetcher, collectionKey: str) -> list:
+    # Same as get_all_articles_in_collection(), but the listing pages are fetched concurrently
+    items = asyncio.run(fetcher.fetch_collection_items(collectionKey, {"itemType": ARTICLE_ITEM_TYPES}))
+    print(f"{len(items)} items fetched from collection {collectionKey} ({fetcher.stats}).")
+    return items
 
-    return df
+def fetch_articles_data_async(fetcher: AsyncZoteroFetcher, keys: list[str]) -> pd.DataFrame:
+    # Same as fetch_articles_data(), but the articles are fetched by concurrent batches of keys
+    print(f"Fetching data for {len(keys)} articles...")
+    itemsData = asyncio.run(fetcher.fetch_items_data(keys))
+    print(f"Articles fetched ({fetcher.stats}).")
+    return build_articles_df([extract_article_data(data) for data in itemsData])
+
+def articles_data_from_items(items: list, keys: list[str]) -> pd.DataFrame:
+    """_summary_
+    Same as fetch_articles_data(), but the data is extracted from already downloaded items (e.g., from get_all_articles_in_collection()),
+    which avoids fetching every article a second time.
+
+    Args:
+        items (list): Zotero items, as returned by the API (each with a "data" field)
+        keys (list[str]): List of keys of the articles to keep, the rows follow their order
+
+    Returns:
+        Dataframe: A DataFrame containing each article's: title, DOI, URL, abstract, date, item type and citation key, as well the list of authors and tags
+    """
+    itemsData = {item["data"]["key"]: item["data"] for item in items}
+    return build_articles_df([extract_article_data(itemsData[key]) for key in keys])
+
+def fetch_articles_data_streaming(
+    zoteroAPI: zotero.Zotero, keys: list[str], chunksDir: Path, chunkSize: int = 200
+) -> ChunkedStore:
+    """_summary_
+    Same as fetch_articles_data(), but the articles are written to a chunked on-disk store (see ChunkedStore) as they arrive,
+    so that at most chunkSize articles are held in memory. If the store already exists (e.g., after a crash),
+    the articles of its completed chunks are skipped and the download resumes from there.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the articles
+        keys (list[str]): List of keys of the articles to fetch
+        chunksDir (Path): Directory of the chunked store
+        chunkSize (int, optional): Number of articles per chunk. Defaults to 200.
+
+    Raises:
+        ValueError: If some keys were not returned by the API (e.g., items deleted since the listing)
+
+    Returns:
+        ChunkedStore: The store, use its load() method to get the DataFrame (or iter_chunks() to go through it chunk by chunk)
+    """
+    store = ChunkedStore(chunksDir)
+    completedKeys = store.completed_keys()
+    remainingKeys = [key for key in keys if key not in completedKeys]
+    print(f"Fetching data for {len(remainingKeys)} articles ({len(keys) - len(remainingKeys)} already stored in {chunksDir})...")
+
+    from tqdm import tqdm
+    for i in tqdm(range(0, len(remainingKeys), chunkSize)):
+        chunkKeys = remainingKeys[i:i + chunkSize]
+        itemsData = {}
+        for j in range(0, len(chunkKeys), MAX_ITEMS_PER_REQUEST):
+            batch = chunkKeys[j:j + MAX_ITEMS_PER_REQUEST]
+            itemsData.update({item["data"]["key"]: item["data"] for item in zoteroAPI.items(itemKey=",".join(batch), limit=len(batch))})
+        # Checked before writing the chunk, the chunks already written are kept for the next run
+        missingKeys = [key for key in chunkKeys if key not in itemsData]
+        if missingKeys:
+            raise ValueError(f"{len(missingKeys)} items were not returned by the Zotero API: {missingKeys}")
+        store.write_chunk(build_articles_df([extract_article_data(itemsData[key]) for key in chunkKeys]), chunkKeys)
+
+    return store
+
+def clone_zotero_API(zoteroAPI: zotero.Zotero) -> zotero.Zotero:
+    from pyzotero import zotero
+    # A pyzotero client keeps the state of its last request (URL parameters, links, etc.), it can't be shared between threads
+    # /!\ library_type is stored with a trailing "s" ("groups" or "users") by pyzotero
+    workerAPI = zotero.Zotero(zoteroAPI.library_id, zoteroAPI.library_type[:-1], zoteroAPI.api_key)
+    workerAPI.endpoint = zoteroAPI.endpoint
+    return workerAPI
+
+def map_with_worker_APIs(zoteroAPI: zotero.Zotero, function, inputs: list, nbWorkers: int) -> Iterator:
+    """Calls function(workerAPI, input) for each input on a pool of nbWorkers threads, each with its own Zotero client, and yields the results in order."""
+    workerAPIs = threading.local()
+    def call(input):
+        if not hasattr(workerAPIs, "api"):
+            workerAPIs.api = clone_zotero_API(zoteroAPI)
+        return function(workerAPIs.api, input)
+
+    with ThreadPoolExecutor(max_workers=nbWorkers) as executor:
+        yield from executor.map(call, inputs)
+
+def fetch_items_data_batched(
+    zoteroAPI: zotero.Zotero, keys: list[str], batchSize: int = MAX_ITEMS_PER_REQUEST, nbWorkers: int = 4
+) -> list[dict]:
+    """_summary_
+    Fetch the "data" payloads of the given items, requesting several keys at once (using the "itemKey" parameter of the Zotero API)
+    and spreading the batches over a pool of nbWorkers threads.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the items
+        keys (list[str]): List of keys of the items to fetch
+        batchSize (int, optional): Number of keys per request, the Zotero API accepts at most 50. Defaults to 50.
+        nbWorkers (int, optional): Number of requests running concurrently. Defaults to 4.
+
+    Raises:
+        ValueError: If batchSize is not in [1, 50], or if some keys were not returned by the API
+
+    Returns:
+        list[dict]: The "data" payloads, in the order of keys
+    """
+    if not 1 <= batchSize <= MAX_ITEMS_PER_REQUEST:
+        raise ValueError(f"batchSize should be between 1 and {MAX_ITEMS_PER_REQUEST}, got {batchSize}.")
+
+    batches = [keys[i:i + batchSize] for i in range(0, len(keys), batchSize)]
+    print(f"Fetching data for {len(keys)} items in {len(batches)} batches of {batchSize}...")
+
+    def fetch_batch(workerAPI: zotero.Zotero, batch: list[str]) -> list[dict]:
+        return [item["data"] for item in workerAPI.items(itemKey=",".join(batch), limit=len(batch))]
+
+    itemsData = {}
+    from tqdm import tqdm
+    for batchData in tqdm(map_with_worker_APIs(zoteroAPI, fetch_batch, batches, nbWorkers), total=len(batches)):
+        for data in batchData:
+            itemsData[data["key"]] = data
+
+    missingKeys = [key for key in keys if key not in itemsData]
+    if missingKeys:
+        raise ValueError(f"{len(missingKeys)} items were not returned by the Zotero API: {missingKeys}")
+
+    # The API does not return the items in the order of the requested keys
+    return [itemsData[key] for key in keys]
+
+def fetch_articles_data_batched(
+    zoteroAPI: zotero.Zotero, keys: list[str], batchSize: int = MAX_ITEMS_PER_REQUEST, nbWorkers: int = 4
+) -> pd.DataFrame:
+    """_summary_
+    Same as fetch_articles_data(), but several keys are requested at once and the batches are spread over a pool of nbWorkers threads
+    (see fetch_items_data_batched()). The returned DataFrame is identical, rows are in the order of keys.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the articles
+        keys (list[str]): List of keys of the articles to fetch
+        batchSize (int, optional): Number of keys per request, the Zotero API accepts at most 50. Defaults to 50.
+        nbWorkers (int, optional): Number of requests running concurrently. Defaults to 4.
+
+    Returns:
+        Dataframe: A DataFrame containing each article's: title, DOI, URL, abstract, date, item type and citation key, as well the list of authors and tags
+    """
+    itemsData = fetch_items_data_batched(zoteroAPI, keys, batchSize, nbWorkers)
+    return build_articles_df([extract_article_data(data) for data in itemsData])
+
+def get_all_articles_in_collections(
+    zoteroAPI: zotero.Zotero, collectionKeys: list[str], nbWorkers: int = 4, cache: Optional[ZoteroItemCache] = None
+) -> tuple[list, dict[str, list[str]]]:
+    """_summary_
+    Multi-collection version of get_all_articles_in_collection(). The item versions of all collections are listed concurrently,
+    then each item is downloaded only once (by batches of keys, or read from the cache), even if it appears in several collections.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the articles
+        collectionKeys (list[str]): Keys of the Zotero collections
+        nbWorkers (int, optional): Number of requests running concurrently. Defaults to 4.
+        cache (ZoteroItemCache, optional): Cache of the item payloads. Defaults to None.
+
+    Returns:
+        tuple[list, dict[str, list[str]]]: The unique items (each with a "data" field), and the collections of each item, by key
+    """
+    def list_versions(workerAPI: zotero.Zotero, collectionKey: str) -> dict[str, int]:
+        return workerAPI.collection_items(collectionKey, itemType=ARTICLE_ITEM_TYPES, format="versions", limit=None)
+
+    versions = {}
+    memberships = {}
+    for collectionKey, collectionVersions in zip(
+        collectionKeys, map_with_worker_APIs(zoteroAPI, list_versions, collectionKeys, nbWorkers)
+    ):
+        print(f"{len(collectionVersions)} items listed in collection {collectionKey}.")
+        for key, version in collectionVersions.items():
+            # An item modified between two listings is seen with two versions, the latest one is fetched
+            versions[key] = max(version, versions.get(key, version))
+            memberships.setdefault(key, []).append(collectionKey)
+
+    if cache is not None:
+        itemsData = get_items_data_through_cache(zoteroAPI, cache, versions)
+    else:
+        itemsData = fetch_items_data_batched(zoteroAPI, list(versions), nbWorkers=nbWorkers)
+    print(f"{len(itemsData)} unique items fetched from {len(collectionKeys)} collections.")
+    return [{"key": data["key"], "version": data["version"], "data": data} for data in itemsData], memberships
+
+def get_sync_state_path(articlesPath: Path) -> Path:
+    # The sync state is stored next to the articles DataFrame, e.g., "all_articles.pkl" -> "all_articles_sync.json"
+    return articlesPath.with_name(f"{articlesPath.stem}_sync.json")
+
+def read_sync_state(syncStatePath: Path) -> Optional[dict]:
+    if not syncStatePath.exists():
+        return None
+    with open(syncStatePath) as f:
+        return json.load(f)
+
+def write_sync_state(syncStatePath: Path, collectionKey: str, libraryVersion: int):
+    with open(syncStatePath, "w") as f:
+        json.dump({"collection": collectionKey, "libraryVersion": libraryVersion}, f, indent=4)
+
+def get_library_version_if_modified(zoteroAPI: zotero.Zotero, sinceVersion: int) -> Optional[int]:
+    """_summary_
+    Ask the Zotero API if the library was modified since the given version, using the "If-Modified-Since-Version" header.
+    pyzotero does not expose this header, so the request is sent directly through its HTTP client.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API of the library
+        sinceVersion (int): The last library version seen
+
+    Returns:
+        int | None: The current library version, or None if the library was not modified (HTTP 304)
+    """
+    response = zoteroAPI.client.get(
+        f"{zoteroAPI.endpoint}/{zoteroAPI.library_type}/{zoteroAPI.library_id}/items",
+        params={"limit": 1, "format": "versions"},
+        headers=zoteroAPI.default_headers() | {"If-Modified-Since-Version": str(sinceVersion)},
+    )
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    return int(response.headers["Last-Modified-Version"])
+
+def merge_articles_data(articlesDf: pd.DataFrame, updatedDf: pd.DataFrame, removedKeys: set[str]) -> pd.DataFrame:
+    """_summary_
+    Merge the articles modified in Zotero into an existing articles DataFrame. Articles are matched on their "Zotero Key":
+    modified articles replace their previous row (keeping its position), new articles are appended, and removed articles are dropped.
+
+    Args:
+        articlesDf (pd.DataFrame): The existing articles DataFrame
+        updatedDf (pd.DataFrame): The DataFrame of the modified (and new) articles
+        removedKeys (set[str]): Zotero keys of the articles deleted, excluded or removed from the collection
+
+    Returns:
+        pd.DataFrame: The merged articles DataFrame
+    """
+    articlesByKey = articlesDf.reset_index().set_index("Zotero Key")
+    updatedByKey = updatedDf.reset_index().set_index("Zotero Key")
+
+    articlesByKey = articlesByKey.drop(index=[key for key in removedKeys if key in articlesByKey.index])
+    newKeys = [key for key in updatedByKey.index if key not in articlesByKey.index]
+    keysOrder = list(articlesByKey.index) + newKeys
+
+    if updatedByKey.empty:
+        # Only removals (e.g., a sync that only deletes items): concatenating an empty DataFrame would turn the columns into object
+        merged = articlesByKey
+    else:
+        merged = pd.concat([articlesByKey.drop(index=updatedByKey.index, errors="ignore"), updatedByKey]).loc[keysOrder]
+    merged = merged.reset_index()[articlesDf.reset_index().columns]
+    return merged.set_index("BBT Citation Key")
+
+def sync_articles_since(
+    zoteroAPI: zotero.Zotero, collectionKey: str, articlesDf: pd.DataFrame, sinceVersion: int
+) -> tuple[pd.DataFrame, ExclusionIndex]:
+    """_summary_
+    Incremental version of get_all_articles_in_collection() + filter_screened_articles() + articles_data_from_items():
+    only the items modified since the given library version are fetched, then merged into the existing articles DataFrame.
+
+    Items modified since sinceVersion are fetched library-wide (an item removed from the collection does not appear in its listing anymore),
+    the deleted items are fetched with the "/deleted" endpoint. Trashed items, items outside of the collection and excluded items are removed.
+
+    Args:
+        zoteroAPI (zotero.Zotero): The Zotero API where to get the articles
+        collectionKey (str): Key of the Zotero collection of the articles
+        articlesDf (pd.DataFrame): The articles DataFrame created at the library version sinceVersion
+        sinceVersion (int): The library version of articlesDf
+
+    Returns:
+        tuple[pd.DataFrame, ExclusionIndex]: The updated articles DataFrame, and the exclusion index of the modified items
+    """
+    zoteroAPI.add_parameters(itemType=ARTICLE_ITEM_TYPES, since=sinceVersion, includeTrashed=1)
+    modifiedItems = zoteroAPI.everything(zoteroAPI.items())
+    deletedKeys = zoteroAPI.deleted(since=sinceVersion)["items"]
+    print(f"{len(modifiedItems)} items modified and {len(deletedKeys)} items deleted since library version {sinceVersion}.")
+
+    modifiedInCollection = [
+        item for item in modifiedItems
+        if collectionKey in item["data"].get("collections", []) and not item["data"].get("deleted", False)
+    ]
+    keysArticlesInSurvey, exclusionCriteria = filter_screened_articles(modifiedInCollection)
+    updatedDf = articles_data_from_items(modifiedInCollection, keysArticlesInSurvey)
+
+    removedKeys = set(deletedKeys) | {item["data"]["key"] for item in modifiedItems} - set(keysArticlesInSurvey)
+    return merge_articles_data(articlesDf, updatedDf, removedKeys), exclusionCriteria
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Save articles data from the Zotero API to a DataFrame.")
-    parser.add_argument("--collection", "-c", type=str, help="Key of the Zotero collection where to get the articles.")
-    parser.add_argument("--output", "-o", type=str, help="Output path for the pickle file.")
+    parser.add_argument("--collection", "-c", type=str, nargs="+", help="Key(s) of the Zotero collection(s) where to get the articles. " \
+                        "With several collections, they are listed concurrently, each item is downloaded once, and its collections are saved in a \"Collections\" column.")
+    parser.add_argument("--output", "-o", type=str, help="Output path of the Dataframe: a Parquet file if it ends with .parquet (requires pyarrow), a pickle file otherwise.")
+    parser.add_argument("--refetch", "-r", action="store_true", help="Fetch each selected article again after the collection listing (guaranteed-fresh copy). By default the articles data is extracted from the listing.")
+    parser.add_argument("--batch-size", "-b", type=int, default=0, help=f"With --refetch, fetch the articles by batches of keys (at most {MAX_ITEMS_PER_REQUEST}) instead of one request per article. Disabled by default.")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Number of batches (or collections) fetched concurrently (only used with --batch-size or several collections). Defaults to 4.")
+    parser.add_argument("--parallel-listing", "-p", action="store_true", help="Fetch all the pages of the collection listing concurrently (on --concurrency requests) instead of one after the other. " \
+                        "Only the listing uses the asyncio engine, unlike --async-engine. Can't be used with --cache.")
+    parser.add_argument("--async-engine", "-a", action="store_true", help="Fetch the collection listing (and the articles with --refetch) with the asyncio engine, sending concurrent requests. Can't be used with --cache.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of concurrent requests of the asyncio engine. Defaults to 8.")
+    parser.add_argument("--incremental", action="store_true", help="Only fetch the items modified since the last run and merge them into the --output DataFrame. " \
+                        "Falls back to a full download if --output or its sync state (<output>_sync.json) does not exist yet.")
+    parser.add_argument("--stream-chunks", type=str, help="With --refetch, write the articles to this directory by chunks as they arrive, " \
+                        "resuming from the last completed chunk if it already exists. The chunks are then merged into --output.")
+    parser.add_argument("--cache", type=str, help="Path of a SQLite cache of the Zotero items: unchanged items are read from it instead of downloaded.")
+    parser.add_argument("--cache-max-age", type=float, help="Remove the items of the cache not used for this number of days.")
+    parser.add_argument("--cache-max-entries", type=int, help="Maximum number of items in the cache (the least recently used are removed).")
+    parser.add_argument("--offline", action="store_true", help="Build the DataFrame entirely from --cache, without accessing the Zotero API.")
+    parser.add_argument("--local-db", type=str, help="Read the articles from the database of the Zotero desktop client (zotero.sqlite, opened read-only) instead of the Zotero API.")
     args = parser.parse_args()
 
+    if args.offline and not args.cache:
+        raise ValueError("--offline requires a --cache path.")
+    if args.offline and args.incremental:
+        raise ValueError("--offline and --incremental can't be used together.")
+    if args.local_db and (args.offline or args.incremental or args.refetch):
+        raise ValueError("--local-db can't be used with --offline, --incremental or --refetch.")
+    if args.collection and len(args.collection) > 1 and (
+        args.offline or args.local_db or args.incremental or args.async_engine or args.parallel_listing or args.stream_chunks
+    ):
+        raise ValueError("Several collections can't be used with --offline, --local-db, --incremental, --async-engine, --parallel-listing or --stream-chunks.")
+    if (args.parallel_listing or args.async_engine) and args.cache:
+        raise ValueError("--parallel-listing and --async-engine can't be used with --cache (the cache lists the item versions instead).")
+    useZoteroAPI = not (args.offline or args.local_db)
+    itemCache = None
+    if args.cache:
+        itemCache = ZoteroItemCache(
+            args.cache, args.cache_max_entries, args.cache_max_age * 24 * 3600 if args.cache_max_age else None
+        )
+
     # Initialize the API
     groupLibraryID = "5602981"
     userLibraryID = "8968938"
-    zoteroAPI = initialize_zotero_API(groupLibraryID, "group")
+    zoteroAPI = initialize_zotero_API(groupLibraryID, "group") if useZoteroAPI else None
     # Key of the group "2. Studies included in review" collection: 'PEWYQYGG'
-    zoteroCollectionKey = args.collection if args.collection else 'PEWYQYGG'
+    zoteroCollectionKeys = args.collection if args.collection else ['PEWYQYGG']
+    zoteroCollectionKey = zoteroCollectionKeys[0]
 
     # Paths to save Dataframes
+    if args.incremental and not args.output:
+        raise ValueError("--incremental requires an --output path to update.")
     if args.output:
         allArticlesPath = Path(args.output)
         allArticlesPath.parent.mkdir(parents=True, exist_ok=True)
@@ -131,22 +580,81 @@ if __name__ == '__main__':
         allDfPaths = Path(__file__).parent.parent.parent / "data" / "Dataframes"
         allArticlesPath = allDfPaths / f"all_articles_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.pkl"
     
-    articlesInCollection = get_all_articles_in_collection(zoteroAPI, zoteroCollectionKey)
+    syncStatePath = get_sync_state_path(allArticlesPath)
+    syncState = read_sync_state(syncStatePath) if args.incremental and allArticlesPath.exists() else None
+    if syncState and syncState["collection"] != zoteroCollectionKey:
+        print(f"The sync state of {allArticlesPath} is for collection {syncState['collection']}, running a full download.")
+        syncState = None
+
+    if syncState:
+        libraryVersion = get_library_version_if_modified(zoteroAPI, syncState["libraryVersion"])
+        if libraryVersion is None:
+            print(f"Library not modified since version {syncState['libraryVersion']}, {allArticlesPath} is up to date.")
+            sys.exit(0)
+
+        allArticlesDF, exclusionCriteria = sync_articles_since(
+            zoteroAPI, zoteroCollectionKey, load_dataframe(allArticlesPath), syncState["libraryVersion"]
+        )
+        for tag, nbExcluded in exclusionCriteria.counts.items():
+            print(f' -  {nbExcluded:>3} modified items excluded for: "{tag[10:]}"')
+
+        save_dataframe(allArticlesDF, allArticlesPath)
+        write_sync_state(syncStatePath, zoteroCollectionKey, libraryVersion)
+        print(f"{len(allArticlesDF)} articles synced to library version {libraryVersion} and saved here: {allArticlesPath}.")
+        sys.exit(0)
+
+    # Get the library version before listing the collection, so that changes made during the download are fetched by the next sync
+    # (The sync state is only kept for a single collection)
+    libraryVersion = zoteroAPI.last_modified_version() if useZoteroAPI and len(zoteroCollectionKeys) == 1 else None
+    collectionMemberships = None
+    if len(zoteroCollectionKeys) > 1:
+        articlesInCollection, collectionMemberships = get_all_articles_in_collections(
+            zoteroAPI, zoteroCollectionKeys, args.workers, itemCache
+        )
+    elif args.local_db:
+        articlesInCollection = get_all_articles_in_local_collection(
+            args.local_db, zoteroCollectionKey, ARTICLE_ITEM_TYPES.split(" || "), int(groupLibraryID)
+        )
+        print(f"{len(articlesInCollection)} items read from collection {zoteroCollectionKey} in {args.local_db}.")
+    elif args.offline:
+        articlesInCollection = get_all_articles_in_collection_from_cache(itemCache, zoteroCollectionKey)
+    elif args.parallel_listing or args.async_engine:
+        fetcher = AsyncZoteroFetcher(groupLibraryID, "group", read_api_key(), concurrency=args.concurrency)
+        articlesInCollection = get_all_articles_in_collection_async(fetcher, zoteroCollectionKey)
+    else:
+        articlesInCollection = get_all_articles_in_collection(zoteroAPI, zoteroCollectionKey, itemCache)
 
     # Each article excluded by the screening process was tagged with the corresponding Exclusion Criteria
     keysArticlesInSurvey, exclusionCriteria = filter_screened_articles(articlesInCollection)
 
-    totalNbExcluded = get_total_in_dict_of_lists(exclusionCriteria)
+    totalNbExcluded = exclusionCriteria.total
     print(f"Total number of items excluded: {totalNbExcluded}.")
-    for tag, keys in exclusionCriteria.items():
-        print(f' -  {len(keys):>3} items excluded for: "{tag[10:]}"')
+    for tag, nbExcluded in exclusionCriteria.counts.items():
+        print(f' -  {nbExcluded:>3} items excluded for: "{tag[10:]}"')
 
     print(f"{totalNbExcluded} excluded items + {len(keysArticlesInSurvey)} selected for review" \
           f" = {len(articlesInCollection)} total items in the review collection")
     assert totalNbExcluded + len(keysArticlesInSurvey) == len(articlesInCollection)
 
-    # Fetch the data and create a DataFrame
-    allArticlesDF = fetch_articles_data(zoteroAPI, keysArticlesInSurvey)
-    allArticlesDF.to_pickle(allArticlesPath)
-    print(f"The data of the screened articles was pickled and saved here: {allArticlesPath}.")
+    # Create the DataFrame (fetching the data again if asked, with several collections the items were already fetched by key)
+    if not args.refetch or args.offline or collectionMemberships is not None:
+        allArticlesDF = articles_data_from_items(articlesInCollection, keysArticlesInSurvey)
+    elif args.stream_chunks:
+        articlesStore = fetch_articles_data_streaming(zoteroAPI, keysArticlesInSurvey, Path(args.stream_chunks))
+        allArticlesDF = articlesStore.load("Zotero Key", keysArticlesInSurvey)
+    elif args.async_engine:
+        allArticlesDF = fetch_articles_data_async(fetcher, keysArticlesInSurvey)
+    elif args.batch_size:
+        allArticlesDF = fetch_articles_data_batched(zoteroAPI, keysArticlesInSurvey, args.batch_size, args.workers)
+    else:
+        allArticlesDF = fetch_articles_data(zoteroAPI, keysArticlesInSurvey, itemCache)
+    if collectionMemberships is not None:
+        allArticlesDF["Collections"] = allArticlesDF["Zotero Key"].map(collectionMemberships)
+    save_dataframe(allArticlesDF, allArticlesPath)
+    if libraryVersion is not None:
+        write_sync_state(syncStatePath, zoteroCollectionKey, libraryVersion)
+    if itemCache is not None:
+        print(f"Cache statistics: {itemCache}.")
+        itemCache.close()
+    print(f"The data of the screened articles was saved here: {allArticlesPath}.")
     # print(articlesDF)
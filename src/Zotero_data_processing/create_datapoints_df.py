@@ -1,15 +1,28 @@
-import pandas as pd
+from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
 import datetime
+import io
+import itertools
+import json
+import re
 import sys
 import os
 
 # Append the parent directory (which contains utils/) to the Python path.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.utils import parse_string_parentheses_braces, extract_year_from_string, print_pretty_df
+from utils.imports import lazy_import
+from utils.utils import parse_string_parentheses_braces, parse_model_descriptor, extract_year_from_string, print_pretty_df, add_numeric_metric_columns, add_categorical_dtypes
+from utils.dataframes import save_dataframe, load_dataframe
+from chunked_store import ChunkedStore
+from datapoints_cache import CachedArticle, DatapointsCache, article_content_hash
+from diagnostics import Diagnostics, DATAFRAME
+
+# Imported on first use (see utils/imports.py), not for --help
+pd = lazy_import("pandas")
 
 # Quick ANSI color code shortcuts
 r = "\033[31m"
@@ -17,46 +30,145 @@ y = "\033[33m"
 g = "\033[32m"
 b = "\033[34m"
 e = "\033[0m"
+ANSI_CODES_PATTERN = re.compile(r"\033\[\d+m")
+
+# Log messages and warnings of the extraction, its verbosity is set by the command line (-v), or by init_worker() in the processes of the pool
+diagnostics = Diagnostics()
+# Part of the key of the datapoints cache: increment it when the extraction changes, so that all the articles are processed again
+EXTRACTOR_VERSION = 1
+
+# Tag prefixes (with ': ') of the main information of an article, of the performance metrics and of the accelerator design details
+MAIN_INFO_TAG_PREFIXES = {
+    "Board": "Board: ",
+    "Implementation": "Implementation: ",
+    "Modality": "Modality: ",
+    "Models": "Model: ",
+    "Datasets": "Dataset: ",
+    "Tasks": "Task: ",
+}
+METRIC_TAG_PREFIXES = {
+    "Latency": "Model latency: ",               # in ms, us or  (an '*' symbol means it's per pixel instead of per patch)
+    "FPS": "Model FPS: ",                       # in FPS
+    "Task score": "Model performance: ",        # in % OA, % F1, % mIoU, etc.
+    "Footprint": "Model size: ",                # in MB
+    "Throughput": "Model throughput: ",         # in GOP/s
+    "Power consumption": "Power consumption: ", # in W
+    "Frequency": "Frequency: ",                 # in MHz
+    "Complexity": "Model complexity: ",         # in OPs (e.g., '50G OP', '45.67M OP')
+}
+DESIGN_TAG_PREFIXES = {
+    "Design": "FPGA Design: ",
+    "Memory": "FPGA Mem: ",
+    "Precision": "FPGA Prec: ",
+    "Optimizations": "FPGA Opt: ",
+    "FPGA Util": "FPGA Util: ",
+    "DPU Config": "DPU Config: ",
+    "DPU Core": "DPU Core: ",
+    "DPU Util": "DPU Util: ",
+    "DPU Optimizations": "DPU Opt: ",
+}
+# Design details reported as comma-separated lists, possibly over several tags
+LIST_DESIGN_DETAILS = ["Optimizations", "DPU Optimizations"]
+VALID_LATENCY_UNITS = ["ms", "s", "us", "ms*", "s*", "us*"]
+
+class ArticleTagIndex:
+    """_summary_
+    Index of the tags of an article, built in a single pass, so that the extractors do not rescan all the tags for each prefix and each model.
+    Tags are indexed by prefix ("<prefix>: ", e.g., "Model latency: "), and, for the tags of articles reporting several models
+    ("<prefix>: (<modelName>) <value>"), by (prefix, modelName) qualifier.
+    Each entry keeps its position in the tags list, so that the extractors see the tags in the same order as before.
+
+    Args:
+        tagsList (List[str]): The list of tags (as strings) of an article
+    """
 
-def get_article_main_info_from_tags(tagsList):
+    def __init__(self, tagsList):
+        self.tagsList = tagsList
+        self.byPrefix = {}      # prefix -> [(position, content)], content being the stripped text after the prefix
+        self.unqualified = {}   # prefix -> [(position, content)], for the contents not starting with "("
+        self.byQualifier = {}   # (prefix, modelName) -> [(position, value)], value being the stripped text after "(<modelName>)"
+
+        for position, tag in enumerate(tagsList):
+            separatorPosition = tag.find(": ")
+            if separatorPosition == -1:
+                continue
+            prefix = tag[:separatorPosition + 2]
+            content = tag[separatorPosition + 2:].strip()
+            self.byPrefix.setdefault(prefix, []).append((position, content))
+            if not content.startswith("("):
+                self.unqualified.setdefault(prefix, []).append((position, content))
+            elif ")" in content:
+                modelNameInTag, value = content[1:].split(")", 1)
+                self.byQualifier.setdefault((prefix, modelNameInTag.strip()), []).append((position, value.strip()))
+
+    def values(self, prefix: str) -> list[str]:
+        """Contents of all the tags with this prefix, in order."""
+        return [content for _, content in self.byPrefix.get(prefix, [])]
+
+    def model_values(self, prefix: str, modelNames: set[str], includeUnqualified: bool) -> list[str]:
+        """Values of the tags with this prefix qualified by one of modelNames (and the unqualified tags if asked), in order."""
+        entries = [entry for modelName in modelNames for entry in self.byQualifier.get((prefix, modelName), [])]
+        if includeUnqualified:
+            entries += self.unqualified.get(prefix, [])
+        return [value for _, value in sorted(entries)]
+
+class ArticleRecord:
+    """_summary_
+    Lightweight row of an article, with only the columns used by the extraction. It is indexed like the pd.Series rows of iterrows()
+    (article["Tags"], article["Date"] and article.name for the BBT Citation Key), so both can be given to the extraction functions,
+    but it is much cheaper to build, see iter_article_records().
+    """
+    __slots__ = ("name", "Tags", "Date")
+
+    def __init__(self, name, Tags, Date):
+        self.name = name
+        self.Tags = Tags
+        self.Date = Date
+
+    def __getitem__(self, column):
+        try:
+            return getattr(self, column)
+        except AttributeError:
+            raise KeyError(column) from None
+
+    def __reduce__(self):
+        return (ArticleRecord, (self.name, self.Tags, self.Date))
+
+def iter_article_records(articlesDf):
+    """Yields an ArticleRecord per article (row) of articlesDf, indexed by the BBT Citation Key, in order."""
+    for citationKey, tags, date in articlesDf[["Tags", "Date"]].itertuples(name=None):
+        yield ArticleRecord(citationKey, tags, date)
+
+def as_article_record(article):
+    """Converts an article record of the ingestion (a dict from extract_article_data(), with its "BBT Citation Key") to an ArticleRecord, other rows are returned as is."""
+    if isinstance(article, dict):
+        return ArticleRecord(article["BBT Citation Key"], article["Tags"], article["Date"])
+    return article
+
+def get_article_main_info_from_tags(tagsList, tagIndex=None, citationKey=None):
     """_summary_
     From the list of tags of an item, return lists with the main information about the article.
     It is used to detect if an item compares several models, possibly on several board/dataset/or even task
 
     Args:
         tagsList (List[str]): The list of tags (as strings) of an article
+        tagIndex (ArticleTagIndex, optional): The index of tagsList, built if not given. Defaults to None.
+        citationKey (str, optional): The BBT Citation Key of the article, for the warnings. Defaults to None.
 
     Returns:
         dict[str, list[str]]: Dictionnary with 6 keys: "Board", "Implementation", "Modality", "Models", "Datasets" and "Tasks" and the corresponding list of tags
     """
-    parsedData = {
-        "Board": [],
-        "Implementation": [],
-        "Modality": [],
-        "Models": [],
-        "Datasets": [],
-        "Tasks": [],
-    }
+    if tagIndex is None:
+        tagIndex = ArticleTagIndex(tagsList)
 
-    for tag in tagsList:
-        if tag.startswith("Dataset:"):
-            parsedData["Datasets"].append(tag.split("Dataset: ")[1].strip())
-        elif tag.startswith("Model:") and tag != "Model: N/A":
-            parsedData["Models"].append(tag.split("Model: ")[1].strip())
-        elif tag.startswith("Board:"):
-            parsedData["Board"].append(tag.split("Board: ")[1].strip())
-        elif tag.startswith("Task:"):
-            parsedData["Tasks"].append(tag.split("Task: ")[1].strip())
-        elif tag.startswith("Implementation:"):
-            parsedData["Implementation"].append(
-                tag.split("Implementation: ")[1].strip()
-            )
-        elif tag.startswith("Modality:"):
-            parsedData["Modality"].append(tag.split("Modality: ")[1].strip())
+    parsedData = {key: tagIndex.values(tagPrefix) for key, tagPrefix in MAIN_INFO_TAG_PREFIXES.items()}
+    parsedData["Models"] = [model for model in parsedData["Models"] if model != "N/A"]
     
     def warning_for_multiple_values(key, dict):
         if len(dict[key]) > 1:
-            log_debug(f"    {r}Warning{e}: Multiple {key}s detected for {b}{tagsList}{e}")
+            diagnostics.warn(
+                f"Multiple {key.lower()}s", citationKey, lambda: f"    {r}Warning{e}: Multiple {key}s detected for {b}{tagsList}{e}"
+            )
 
     warning_for_multiple_values("Board", parsedData)
     warning_for_multiple_values("Implementation", parsedData)
@@ -64,7 +176,7 @@ def get_article_main_info_from_tags(tagsList):
     return parsedData
 
 def extract_metrics(
-    article, reportsSeveralModels=False, fullTagModelName=""
+    article, reportsSeveralModels=False, fullTagModelName="", tagIndex=None
 ):
     """_summary_
     Extracts all systematically reported performance metrics from a DataFrame's row.
@@ -81,10 +193,11 @@ def extract_metrics(
     If a metric is missing, i.e., value 'N/A', it is notified and its value is set to an empty string (for clarity when printing).
 
     Args:
-        article (pd.Series): a DataFrame's row (a single article), containing all the data of a model reported in an article.
+        article (pd.Series | ArticleRecord): a DataFrame's row (a single article), containing all the data of a model reported in an article.
         reportsSeveralModels (bool, optional): whether the article reports several models or not. Defaults to False.
         fullTagModelName (str, optional): the name of the model with all its info, it is ONLY used when reportsSeveralModels is True.
                                           In which case the tags with the metrics of interest start with "(<backbone>)" or "(<modelName>)". Defaults to "".
+        tagIndex (ArticleTagIndex, optional): The index of the article's tags, built if not given. Defaults to None.
 
     Returns:
         dict[str, str]: Dictionary with 5 keys: "Latency", "Task score", "Footprint", "Throughput" and "Power consumption".
@@ -96,93 +209,65 @@ def extract_metrics(
                 f"fullTagModelName should be given when an article reports several models, see {citationKey}"
             )
         else:
-            modelName, _, backbone = parse_string_parentheses_braces(fullTagModelName)
-
-    # Define a mapping of clean metric names to their tag prefixes (with ': ')
-    metricKeys = {
-        "Latency": "Model latency: ",               # in ms, us or  (an '*' symbol means it's per pixel instead of per patch)
-        "FPS": "Model FPS: ",                       # in FPS
-        "Task score": "Model performance: ",        # in % OA, % F1, % mIoU, etc.
-        "Footprint": "Model size: ",                # in MB
-        "Throughput": "Model throughput: ",         # in GOP/s
-        "Power consumption": "Power consumption: ", # in W
-        "Frequency": "Frequency: ",                 # in MHz
-        "Complexity": "Model complexity: ",         # in OPs (e.g., '50G OP', '45.67M OP')
-    }
+            modelName, _, backbone = parse_model_descriptor(fullTagModelName)
+
+    if tagIndex is None:
+        tagIndex = ArticleTagIndex(article["Tags"])
 
     metricsFoundDict = {}
     missingMetricsList = []
 
-    def extract_metric_value(tag, tagPrefix):
-        """Helper function to extract metric value from a tag."""
-        metricValue = tag[len(tagPrefix):].strip()
-        return "" if metricValue.startswith("N/A") else metricValue
-
-    for metric, tagPrefix in metricKeys.items():
-        found = False
-        for tag in article["Tags"]:
-            if tag.startswith(tagPrefix):
-                # Check for the parenthesis syntax (for articles reporting several models)
-                if reportsSeveralModels:
-                    # Extract model name from tag (e.g., '(ModelName)')
-                    tagContent = tag[len(tagPrefix):].strip()
-                    if tagContent.startswith('('):
-                        modelNameInTag = tagContent[1:].split(')')[0].strip()
-                        if modelNameInTag == modelName or modelNameInTag == backbone:
-                            metricValue = tagContent.split(')', 1)[1].strip()
-                            metricsFoundDict[metric] = "" if metricValue.startswith("N/A") else metricValue
-                            found = True
-                            break
-                    else:
-                        # If the tag does not start by the model name, it means its value is 'N/A' or it's the Frequency metric
-                        if tag.startswith("Frequency:"):
-                            metricValue = extract_metric_value(tag, tagPrefix)
-                            metricsFoundDict[metric] = metricValue
-                            found = True
-                            break
-                        else:
-                            if 'N/A' in tag: metricValue = 'N/A'
-
-                # If the article does not report several models, the tag is directly the metric value
-                else:
-                    metricValue = extract_metric_value(tag, tagPrefix)
-                    metricsFoundDict[metric] = metricValue
-                    found = True
-                    break
+    for metric, tagPrefix in METRIC_TAG_PREFIXES.items():
+        # Check for the parenthesis syntax (for articles reporting several models), e.g., "<tagPrefix>(ModelName) <value>"
+        # If the tag does not start by the model name, it means its value is 'N/A' or it's the Frequency metric
+        if reportsSeveralModels:
+            metricValues = tagIndex.model_values(tagPrefix, {modelName, backbone}, includeUnqualified=(tagPrefix == "Frequency: "))
+        # If the article does not report several models, the tag is directly the metric value
+        else:
+            metricValues = tagIndex.values(tagPrefix)
+
+        found = len(metricValues) > 0
+        if found:
+            metricsFoundDict[metric] = "" if metricValues[0].startswith("N/A") else metricValues[0]
 
         if not found:
             metricsFoundDict[metric] = ""
             missingMetricsList.append(metric)
         else: # Specific handling for some metrics
             if metric == "Model performance" and "Acc" in metricsFoundDict[metric]:
-                log_debug(f"    {r}Acc metric warning{e}: Model performance was reported as Acc in {b}{citationKey}{e}: {g}{metricsFoundDict[metric]}{e}, replacing it with OA")
+                diagnostics.warn("Acc metric", citationKey, lambda: f"    {r}Acc metric warning{e}: Model performance was reported as Acc in {b}{citationKey}{e}: {g}{metricsFoundDict[metric]}{e}, replacing it with OA")
                 metricsFoundDict[metric] = metricsFoundDict[metric].replace("Acc", "OA")
             # Specific handling for 'Frequency' metric (ensure unit is MHz)
             elif metric == "Frequency" and metricsFoundDict[metric] and not metricsFoundDict[metric].endswith("MHz"):
-                log_debug(f"    {r}Frequency unit warning{e}: Frequency in {b}{citationKey}{e} is not in MHz: {g}{metricsFoundDict[metric]}{e}")
+                diagnostics.warn("Unit", citationKey, lambda: f"    {r}Frequency unit warning{e}: Frequency in {b}{citationKey}{e} is not in MHz: {g}{metricsFoundDict[metric]}{e}", detail=metric)
             # Specific handling for 'Model complexity' metric (ensure unit is OP)
             elif metric == "Model complexity" and not metricsFoundDict[metric].endswith("OP"):
-                log_debug(f"    {r}Model complexity unit warning{e}: Model complexity in {b}{citationKey}{e} does not have 'OP' unit: {g}{metricsFoundDict[metric]}{e}")
+                diagnostics.warn("Unit", citationKey, lambda: f"    {r}Model complexity unit warning{e}: Model complexity in {b}{citationKey}{e} does not have 'OP' unit: {g}{metricsFoundDict[metric]}{e}", detail=metric)
             # Specific handling for 'Latency' metric (ensure unit is ms, s, or us)
             elif metric == "Latency":
-                valid_units = ["ms", "s", "us", "ms*", "s*", "us*"]
-                if metricsFoundDict[metric] and not any(metricsFoundDict[metric].endswith(u) for u in valid_units):
-                    log_debug(
-                        f"    {r}Latency unit warning{e}: Latency in "
-                        f"{b}{citationKey}{e} is not in one of {valid_units}: "
-                        f"{g}{metricsFoundDict[metric]}{e}"
+                if metricsFoundDict[metric] and not any(metricsFoundDict[metric].endswith(u) for u in VALID_LATENCY_UNITS):
+                    diagnostics.warn(
+                        "Unit", citationKey,
+                        lambda: f"    {r}Latency unit warning{e}: Latency in "
+                        f"{b}{citationKey}{e} is not in one of {VALID_LATENCY_UNITS}: "
+                        f"{g}{metricsFoundDict[metric]}{e}",
+                        detail=metric,
                     )
             elif metric == "FPS":
                 if metricsFoundDict[metric] and not metricsFoundDict[metric].endswith("FPS"):
-                    log_debug(
-                        f"    {r}FPS unit warning{e}: FPS in "
+                    diagnostics.warn(
+                        "Unit", citationKey,
+                        lambda: f"    {r}FPS unit warning{e}: FPS in "
                         f"{b}{citationKey}{e} does not end in 'FPS': "
-                        f"{g}{metricsFoundDict[metric]}{e}"
+                        f"{g}{metricsFoundDict[metric]}{e}",
+                        detail=metric,
                     )
 
     if missingMetricsList:
         modelIdentifier = modelName if reportsSeveralModels else 'its unique model'
-        log_debug(f"    {r}Missing metric warning{e}: {b}{citationKey}{e} misses: {r}{', '.join(missingMetricsList)}{e} metrics for {b}{modelIdentifier}{e}")
+        diagnostics.debug(lambda: f"    {r}Missing metric warning{e}: {b}{citationKey}{e} misses: {r}{', '.join(missingMetricsList)}{e} metrics for {b}{modelIdentifier}{e}")
+        for metric in missingMetricsList:
+            diagnostics.warn("Missing metric", citationKey, detail=metric)
 
     return metricsFoundDict
 
@@ -191,7 +276,7 @@ def extract_metrics(
 # But in the future I'd like to make a distinction between DPU and classic RTL/HLS accelerators.
 # @TODO: There is also a "bug", for pitonakCloudSatNet1FPGABasedHardwareAccelerated2022 for example, I reused the (<model_name>) mechanic, 
 # because the reported models use different Precision, I have to account for that in the extraction.
-def extract_accelerator_design(article, articleMainInfo, reportsSeveralModels=False, fullTagModelName=""):
+def extract_accelerator_design(article, articleMainInfo, reportsSeveralModels=False, fullTagModelName="", tagIndex=None):
     """_summary_
     Extracts the accelerator design details from the tags of an article.
     If an article reports several models, the parentheses syntax ("<tagNme>: (<modelName>) <value>") is checked for each tag.
@@ -211,8 +296,9 @@ def extract_accelerator_design(article, articleMainInfo, reportsSeveralModels=Fa
     - The Precision is also reported and the same.
 
     Args:
-        article (pd.Series): a DataFrame's row (a single article), containing all the data of a model reported in an article.
+        article (pd.Series | ArticleRecord): a DataFrame's row (a single article), containing all the data of a model reported in an article.
         articleMainInfo (dict[str, list[str]]): a dictionary with 6 keys: "Board", "Implementation", "Modality", "Models", "Datasets" and "Tasks".
+        tagIndex (ArticleTagIndex, optional): The index of the article's tags, built if not given. Defaults to None.
 
     Returns:
         dict[str, list[str]]: List of the tags and their values
@@ -223,52 +309,40 @@ def extract_accelerator_design(article, articleMainInfo, reportsSeveralModels=Fa
                 f"fullTagModelName should be given when an article reports several models, see {article.name}"
             )
         else:
-            modelName, _, backbone = parse_string_parentheses_braces(fullTagModelName)
+            modelName, _, backbone = parse_model_descriptor(fullTagModelName)
     
-    detailsKeys = {
-        "Design": "FPGA Design: ",
-        "Memory": "FPGA Mem: ",
-        "Precision": "FPGA Prec: ",
-        "Optimizations": "FPGA Opt: ",
-        "FPGA Util": "FPGA Util: ",
-        "DPU Config": "DPU Config: ",
-        "DPU Core": "DPU Core: ",
-        "DPU Util": "DPU Util: ",
-        "DPU Optimizations": "DPU Opt: ",
-    }
+    if tagIndex is None:
+        tagIndex = ArticleTagIndex(article["Tags"])
 
     detailsFoundDict = {}
-    tags = article["Tags"]
-    
+
     # Check if the implementation is Vitis AI
     is_vitis_ai = any(impl == "Vitis AI" for impl in articleMainInfo["Implementation"])
 
     # Initialize detailsFoundDict with keys and default values
-    for key in detailsKeys.keys():
-        if key in ["Optimizations", "DPU Optimizations"]:
+    for key in DESIGN_TAG_PREFIXES.keys():
+        if key in LIST_DESIGN_DETAILS:
             detailsFoundDict[key] = []
         else:
             detailsFoundDict[key] = ""
 
-    # Go through the tags and extract values
-    for tag in tags:
-        for key, tagPrefix in detailsKeys.items():
-            if tag.startswith(tagPrefix):
-                tagContent = tag[len(tagPrefix):].strip()
-                if reportsSeveralModels and tagContent.startswith('('):
-                    modelNameInTag = tagContent[1:].split(')')[0].strip()
-                    if modelNameInTag == modelName or modelNameInTag == backbone:
-                        # print(f"In {article.name}, for Model {fullTagModelName}, {tagPrefix}: {tagContent}")
-                        tagContent = tagContent.split(')', 1)[1].strip()
-                    else:
-                        continue
-                if key in ["Optimizations", "DPU Optimizations"]:
-                    # Handle multiple optimizations
-                    optimizations = [opt.strip() for opt in tagContent.split(',')]
-                    detailsFoundDict[key].extend(optimizations)
-                else:
-                    detailsFoundDict[key] = tagContent
-                break  # Found the tag, move to the next
+    # Extract the values of the tags, the tags of other models ("<tagPrefix>(<otherModel>) <value>") are skipped
+    for key, tagPrefix in DESIGN_TAG_PREFIXES.items():
+        if reportsSeveralModels:
+            tagContents = tagIndex.model_values(tagPrefix, {modelName, backbone}, includeUnqualified=True)
+        else:
+            tagContents = tagIndex.values(tagPrefix)
+        if not tagContents:
+            continue
+
+        if key in LIST_DESIGN_DETAILS:
+            # Handle multiple optimizations
+            for tagContent in tagContents:
+                optimizations = [opt.strip() for opt in tagContent.split(',')]
+                detailsFoundDict[key].extend(optimizations)
+        else:
+            # The last tag wins
+            detailsFoundDict[key] = tagContents[-1]
 
     return detailsFoundDict
 
@@ -310,17 +384,18 @@ def check_article_validity(articleMainInfo, citationKey):
 
 def process_article(citationKey, article):
 
-    articleMainInfo = get_article_main_info_from_tags(article["Tags"])
+    tagIndex = ArticleTagIndex(article["Tags"])
+    articleMainInfo = get_article_main_info_from_tags(article["Tags"], tagIndex, citationKey)
     check_article_validity(articleMainInfo, citationKey)
-    log_debug(""); log_debug(f"Main information: {articleMainInfo}")
+    diagnostics.debug(""); diagnostics.debug(lambda: f"Main information: {articleMainInfo}")
 
     modelsFromArticle = []
     nbModels = len(articleMainInfo["Models"])
     nbDatasets = len(articleMainInfo["Datasets"])
-    log_info(f"- {y}(Processing){e} {b}{citationKey}{e} reports {r}{nbModels}{e} models.")
+    diagnostics.info(lambda: f"- {y}(Processing){e} {b}{citationKey}{e} reports {r}{nbModels}{e} models.")
 
     for i, model in enumerate(articleMainInfo["Models"]):
-        nameUsedInArticle, nameCorrespondingModel, backbone = parse_string_parentheses_braces(model)
+        nameUsedInArticle, nameCorrespondingModel, backbone = parse_model_descriptor(model)
 
         # Check for specific articles that require overridden info
         specificInfo = get_hardcoded_articles(citationKey, nameUsedInArticle)
@@ -364,43 +439,317 @@ def process_article(citationKey, article):
             article,
             reportsSeveralModels=(nbModels > 1),
             fullTagModelName=model,
+            tagIndex=tagIndex,
         )
         fpga_accelerator = extract_accelerator_design(
             article,
             articleMainInfo, # unused so far
             reportsSeveralModels=(nbModels > 1),
-            fullTagModelName=model
+            fullTagModelName=model,
+            tagIndex=tagIndex,
         )
 
         modelsFromArticle.append(main_info | performance_metrics | fpga_accelerator)
 
-        log_info(
-            f"      - {b}{nameUsedInArticle}{e} ({backbone}) on {b}{dataset}{e} with performance: {r}{list(performance_metrics.values())}{e}."
+        diagnostics.info(
+            lambda: f"      - {b}{nameUsedInArticle}{e} ({backbone}) on {b}{dataset}{e} with performance: {r}{list(performance_metrics.values())}{e}."
         )
 
     return modelsFromArticle
 
-def log_info(msg):
-    if VERBOSITY >= 1: print(msg)
-def log_debug(msg):
-    if VERBOSITY >= 2: print(msg)
+def iter_datapoints(articles):
+    """_summary_
+    Yields the datapoint rows of the articles lazily, one article after the other, stopping at the first error.
+    Only the current article and its rows are held in memory, so the articles can come straight from the ingestion
+    (e.g., the chunks of a ChunkedStore, see iter_article_records()) and the rows can go to a sink (see write_datapoints_chunked()).
+
+    Args:
+        articles (Iterable[ArticleRecord | pd.Series | dict]): The articles: rows with a name (their BBT Citation Key) or records of the ingestion
+
+    Raises:
+        ValueError: If an article is badly tagged or did not report any model
+
+    Yields:
+        dict: The datapoint rows, in the order of the articles
+    """
+    for article in articles:
+        article = as_article_record(article)
+        modelsReportedInArticle = process_article(article.name, article)
+        if not modelsReportedInArticle:
+            raise ValueError(f"{y}(SKIPPED){e}: {b}{article.name}{e} did not report any model.") # Should not happen, errors are raised earlier, but ... you never know 😅
+        yield from modelsReportedInArticle
+
+def init_worker(verbosity):
+    diagnostics.verbosity = verbosity
+
+def process_article_safely(citationKey, article):
+    """_summary_
+    Runs process_article() on an article, capturing its log messages, its warnings and its error (if any) instead of raising it,
+    so that a run goes through all the articles and reports all their problems at once.
+
+    Args:
+        citationKey (str): The BBT Citation Key of the article
+        article (pd.Series | ArticleRecord): The row of the article
+
+    Returns:
+        tuple[list[dict], str, dict | None, list[tuple]]: The datapoints of the article (empty on error), the log messages printed while processing it,
+                                                          the error record ({"BBT Citation Key", "Error", "Message"}) or None, and the warnings recorded
+    """
+    logBuffer = io.StringIO()
+    with contextlib.redirect_stdout(logBuffer):
+        try:
+            modelsReportedInArticle = process_article(citationKey, article)
+            if not modelsReportedInArticle:
+                raise ValueError(f"{y}(SKIPPED){e}: {b}{citationKey}{e} did not report any model.")
+        except Exception as error:
+            errorRecord = {
+                "BBT Citation Key": citationKey,
+                "Error": type(error).__name__,
+                "Message": ANSI_CODES_PATTERN.sub("", str(error)).strip(),
+            }
+            return [], logBuffer.getvalue(), errorRecord, diagnostics.pop_events()
+    return modelsReportedInArticle, logBuffer.getvalue(), None, diagnostics.pop_events()
+
+def extract_datapoints_parallel(articlesDf, nbJobs, chunkSize=8):
+    """_summary_
+    Extracts the datapoints of all the articles on a pool of processes. The datapoints and the log messages keep the order of the rows,
+    and the errors are collected for all the articles instead of stopping at the first one.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+        nbJobs (int): Number of processes
+        chunkSize (int, optional): Number of articles sent at once to a process. Defaults to 8.
+
+    Returns:
+        tuple[list[dict], int, list[dict]]: The datapoints, the number of articles processed without error, and the error records
+    """
+    listOfModelsFromArticle = []
+    errors = []
+    from tqdm import tqdm
+    with ProcessPoolExecutor(max_workers=nbJobs, initializer=init_worker, initargs=(diagnostics.verbosity,)) as executor:
+        # ArticleRecords only hold the columns used by the extraction, they are cheap to send to the processes
+        results = executor.map(
+            process_article_safely, articlesDf.index, iter_article_records(articlesDf), chunksize=chunkSize
+        )
+        for modelsReportedInArticle, logOutput, errorRecord, events in tqdm(results, total=len(articlesDf), disable=diagnostics.verbosity > 0):
+            print(logOutput, end="")
+            diagnostics.record_events(events)
+            if errorRecord:
+                errors.append(errorRecord)
+            else:
+                listOfModelsFromArticle.extend(modelsReportedInArticle)
+    return listOfModelsFromArticle, len(articlesDf) - len(errors), errors
+
+def extract_datapoints_sequential(articlesDf):
+    """_summary_
+    Extracts the datapoints of all the articles, one after the other, stopping at the first error.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+
+    Raises:
+        ValueError: If an article is badly tagged or did not report any model
+
+    Returns:
+        tuple[list[dict], int]: The datapoints and the number of articles processed
+    """
+    return list(iter_datapoints(iter_article_records(articlesDf))), len(articlesDf)
+
+def extract_datapoints_incremental(articlesDf, cache, nbJobs=1):
+    """_summary_
+    Extracts the datapoints of all the articles, but only processes the articles that are new or changed (tags or date) since the
+    last run, or all of them if EXTRACTOR_VERSION changed. The datapoints of the other articles are read from the cache,
+    and all the datapoints are spliced back together in the order of the articles. The articles that failed (with nbJobs > 1)
+    are cached with their error record, which is reported again until they change. The warnings of each article are cached with it
+    and recorded again in the order of the articles, so that the diagnostics are the same whether the articles are cached or not.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+        cache (DatapointsCache): The cache of the datapoints of each article, updated with the processed articles
+        nbJobs (int, optional): Number of processes extracting the new and changed articles, see extract_datapoints_parallel(). Defaults to 1.
+
+    Returns:
+        tuple[list[dict], int, list[dict]]: The datapoints, the number of articles processed or read from the cache without error,
+                                            and the error records (with nbJobs > 1), including those read from the cache
+    """
+    contentHashes = {
+        article.name: article_content_hash(article.Tags, article.Date, EXTRACTOR_VERSION) for article in iter_article_records(articlesDf)
+    }
+    cachedArticles = {citationKey: cache.get(citationKey, contentHash) for citationKey, contentHash in contentHashes.items()}
+    changedKeys = [citationKey for citationKey, article in cachedArticles.items() if article is None]
+    diagnostics.info(lambda: f"{b}{len(articlesDf) - len(changedKeys)}{e} articles read from the cache, {r}{len(changedKeys)}{e} new or changed articles to process.")
+
+    if changedKeys:
+        # The warnings of the processed articles are collected apart, to be cached with each article
+        previousEvents = diagnostics.pop_events()
+        newErrors = []
+        if nbJobs > 1:
+            newModels, _, newErrors = extract_datapoints_parallel(articlesDf.loc[changedKeys], nbJobs)
+        else:
+            newModels, _ = extract_datapoints_sequential(articlesDf.loc[changedKeys])
+        eventsByArticle = {}
+        for event in diagnostics.pop_events():
+            eventsByArticle.setdefault(event[1], []).append(event)
+        diagnostics.record_events(previousEvents)
+        # Every processed article gets a cache entry, even without datapoints (e.g., when it failed), so that it is not processed again
+        newDatapointsByArticle = {citationKey: [] for citationKey in changedKeys}
+        for model in newModels:
+            newDatapointsByArticle.setdefault(model["BBT Citation Key"], []).append(model)
+        errorsByArticle = {errorRecord["BBT Citation Key"]: errorRecord for errorRecord in newErrors}
+        newArticles = {
+            citationKey: CachedArticle(datapoints, errorsByArticle.get(citationKey), tuple(eventsByArticle.get(citationKey, ())))
+            for citationKey, datapoints in newDatapointsByArticle.items()
+        }
+        cache.put({citationKey: (contentHashes[citationKey], article) for citationKey, article in newArticles.items()})
+        cachedArticles.update(newArticles)
+    cache.keep_only(list(contentHashes))
+
+    for article in cachedArticles.values():
+        diagnostics.record_events(article.events)
+    # The articles that failed have no datapoints
+    listOfModelsFromArticle = [model for article in cachedArticles.values() for model in article.datapoints]
+    errors = [article.error for article in cachedArticles.values() if article.error is not None]
+    return listOfModelsFromArticle, len(articlesDf) - len(errors), errors
+
+def write_datapoints_chunked(datapoints, store, chunkSize=500):
+    """_summary_
+    Sink of iter_datapoints(): writes the datapoint rows to a chunked on-disk store by batches of about chunkSize rows,
+    so that at most one batch is held in memory. The rows of an article are never split over two chunks,
+    each chunk is recorded in the store with the BBT Citation Keys of its articles and the warnings recorded while processing them.
+
+    Args:
+        datapoints (Iterable[dict]): The datapoint rows, with the rows of each article next to each other
+        store (ChunkedStore): The store where to write the chunks
+        chunkSize (int, optional): Number of rows after which a chunk is written. Defaults to 500.
+
+    Returns:
+        int: The number of rows written
+    """
+    nbRows = 0
+    chunkRows = []
+    chunkKeys = []
+    eventsOffset = len(diagnostics.events)
+
+    def write_chunk():
+        nonlocal eventsOffset
+        # Warnings recorded since the previous chunk: those of the chunk, possibly mixed with those replayed for skipped articles
+        # (see extract_datapoints_streaming()) and followed by those of the next article (already processed by groupby)
+        chunkKeysSet = set(chunkKeys)
+        chunkEvents = []
+        for i, event in enumerate(diagnostics.events[eventsOffset:], start=eventsOffset + 1):
+            if event[1] in chunkKeysSet:
+                chunkEvents.append(event)
+                lastEvent = i
+        if chunkEvents:
+            eventsOffset = lastEvent
+        store.write_chunk(pd.DataFrame(chunkRows), chunkKeys, chunkEvents)
+
+    for citationKey, modelsReportedInArticle in itertools.groupby(datapoints, key=lambda model: model["BBT Citation Key"]):
+        chunkRows.extend(modelsReportedInArticle)
+        chunkKeys.append(citationKey)
+        if len(chunkRows) >= chunkSize:
+            write_chunk()
+            nbRows += len(chunkRows)
+            chunkRows, chunkKeys = [], []
+    if chunkRows:
+        write_chunk()
+        nbRows += len(chunkRows)
+    return nbRows
+
+def extract_datapoints_streaming(articles, store, chunkSize=500):
+    """_summary_
+    Extracts the datapoints of the articles with iter_datapoints() and writes them to a chunked store with write_datapoints_chunked(),
+    stopping at the first error. Only the store is returned, so that the memory stays bounded: the datapoints can be read chunk by chunk
+    (ChunkedStore.iter_chunks()), or all at once with load_datapoints_chunks(). The articles whose datapoints are already in the store (e.g., written before a crash) are skipped,
+    their warnings are read from the store and recorded again in the order of the articles.
+
+    Args:
+        articles (Iterable[ArticleRecord | pd.Series | dict]): The articles, see iter_datapoints()
+        store (ChunkedStore): The store of the datapoints
+        chunkSize (int, optional): Number of rows after which a chunk is written. Defaults to 500.
+
+    Returns:
+        tuple[ChunkedStore, list[str]]: The store and the BBT Citation Keys of the articles, in order
+    """
+    completedKeys = store.completed_keys()
+    storedEvents = {}
+    for event in store.completed_events():
+        storedEvents.setdefault(event[1], []).append(event)
+    citationKeys = []  # Only the keys are kept, to order the rows and drop those of articles no longer given
+
+    def remaining_articles():
+        for article in map(as_article_record, articles):
+            citationKeys.append(article.name)
+            if article.name in completedKeys:
+                diagnostics.record_events(storedEvents.get(article.name, []))
+            else:
+                yield article
+
+    nbRows = write_datapoints_chunked(iter_datapoints(remaining_articles()), store, chunkSize)
+    nbStoredArticles = sum(citationKey in completedKeys for citationKey in citationKeys)
+    diagnostics.info(lambda: f"{r}{nbRows}{e} new datapoints written, the datapoints of {b}{nbStoredArticles}{e} articles were already stored.")
+    return store, citationKeys
+
+def load_datapoints_chunks(store, citationKeys):
+    """_summary_
+    Reads the datapoints written by extract_datapoints_streaming() in a single DataFrame (the whole DataFrame is then in memory).
+
+    Args:
+        store (ChunkedStore): The store of the datapoints
+        citationKeys (list[str]): The BBT Citation Keys of the articles, the rows of the other articles in the store are dropped
+
+    Returns:
+        pd.DataFrame: The datapoints, in the order of the articles
+    """
+    if not store.chunks:
+        return pd.DataFrame()
+    return store.load("BBT Citation Key", citationKeys).reset_index(drop=True)
+
+def print_error_report(errors, errorReportPath=None):
+    if not errors:
+        print(f"{g}No article failed.{e}")
+        return
+    print(f"{r}{len(errors)}{e} articles failed and were skipped:")
+    for errorRecord in errors:
+        print(f"- {b}{errorRecord['BBT Citation Key']}{e} ({errorRecord['Error']}): {errorRecord['Message']}")
+    if errorReportPath:
+        with open(errorReportPath, "w") as f:
+            json.dump(errors, f, indent=2)
+        print(f"Error report saved at: {errorReportPath}.")
+
+def print_diagnostics_summary(summaryPath=None):
+    for category, categorySummary in diagnostics.summary().items():
+        details = f" ({', '.join(f'{detail}: {count}' for detail, count in categorySummary['byDetail'].items())})" if "byDetail" in categorySummary else ""
+        diagnostics.info(lambda: f"{r}{categorySummary['count']}{e} {category} warnings in {b}{len(categorySummary['byCitationKey'])}{e} articles{details}.")
+    if summaryPath:
+        diagnostics.write_summary(summaryPath)
+        print(f"Diagnostics summary saved at: {summaryPath}.")
+
 def log_dataframe(df):
-    if VERBOSITY >= 3:
+    if diagnostics.is_enabled(DATAFRAME):
         print_pretty_df(df)
         print(f"{r}The Datfarme being very wide, it is recommended to redirect the script output to a file.{e}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract all experiments from each individual article.")
-    parser.add_argument("--input", "-i", type=str, help="Path of the input Dataframe with the articles.")
-    parser.add_argument("--output", "-o", type=str, help="Output path for the pickled Dataframe.")
+    parser.add_argument("--input", "-i", type=str, help="Path of the input Dataframe with the articles (.parquet or .pkl), or directory of the article chunks written by create_articles_df.py --stream-chunks.")
+    parser.add_argument("--output", "-o", type=str, help="Output path of the Dataframe: a Parquet file if it ends with .parquet (requires pyarrow), a pickle file otherwise.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of processes extracting the articles. Above 1, the errors of all the articles are collected in a report instead of stopping at the first one.")
+    parser.add_argument("--error-report", type=str, help="Output path for the JSON report of the articles that failed (with --jobs above 1).")
+    parser.add_argument("--cache", type=str, help="Path of a SQLite cache of the datapoints of each article: only the new or changed articles are processed again.")
+    parser.add_argument("--stream-chunks", type=str, help="Extract the datapoints lazily and write them to this directory by chunks, with bounded memory, " \
+                        "skipping the articles already written there (e.g., before a crash). The chunks are then merged into --output.")
+    parser.add_argument("--vectorized", action="store_true", help="Extract all the articles at once with vectorized operations on their exploded tags (see vectorized_extraction.py), " \
+                        "faster on large corpora. The datapoints and warnings are the same, but the messages of the warnings are not printed.")
+    parser.add_argument("--diagnostics", type=str, help="Output path for the JSON summary of the warnings (per category and per BBT Citation Key).")
     parser.add_argument("-v", "--verbose", action="count", default=0, help="Increase verbosity. Use multiple -v for higher verbosity. 3 is the highest: prints everything, including the full Dataframe created.")
     args = parser.parse_args()
 
-    VERBOSITY = args.verbose if args.verbose else 0
-    if VERBOSITY == 0:
+    diagnostics.verbosity = args.verbose if args.verbose else 0
+    if diagnostics.verbosity == 0:
         print("Verbosity: [NONE] Minimal info.")
-    elif VERBOSITY == 1:
+    elif diagnostics.verbosity == 1:
         print("Verbosity: [INFO] Normal verbose info.")
     else:
         print("Verbosity: [DEBUG] Full debug info.")
@@ -408,6 +757,16 @@ if __name__ == "__main__":
     # Paths management
     if not args.input:
         raise ValueError("An input path is required.")
+    if args.jobs < 1:
+        raise ValueError(f"--jobs should be at least 1, got {args.jobs}.")
+    if args.error_report and args.jobs == 1:
+        raise ValueError("--error-report requires --jobs above 1, the sequential extraction stops at the first error.")
+    if args.stream_chunks and (args.jobs > 1 or args.cache):
+        raise ValueError("--stream-chunks can't be used with --jobs above 1 or --cache.")
+    if args.vectorized and (args.jobs > 1 or args.cache or args.stream_chunks):
+        raise ValueError("--vectorized can't be used with --jobs above 1, --cache or --stream-chunks.")
+    if Path(args.input).is_dir() and not args.stream_chunks:
+        raise ValueError(f"{args.input} is a directory of article chunks, which requires --stream-chunks.")
     if args.output:
         allDatapointsPath = Path(args.output)
         allDatapointsPath.parent.mkdir(parents=True, exist_ok=True)
@@ -415,25 +774,56 @@ if __name__ == "__main__":
         allDfPaths = Path(__file__).parent.parent.parent / "data" / "Dataframes"
         allDatapointsPath = allDfPaths / f"all_datapoints_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.pkl"
 
-    log_debug(f"Dataframe read from path: {args.input}")
-    articlesDf = pd.read_pickle(args.input)
-    
-    # Main processing loop
-    listOfModelsFromArticle = []
-    nbArticlesProcessed = 0
+    diagnostics.debug(f"Dataframe read from path: {args.input}")
+    if Path(args.input).is_dir():
+        # Articles read chunk by chunk, only one chunk is in memory at a time
+        articles = (article for chunk in ChunkedStore(args.input).iter_chunks() for article in iter_article_records(chunk))
+    else:
+        # Only the columns used by the extraction (with Parquet, the other columns are not read at all)
+        articlesDf = load_dataframe(args.input, columns=["Tags", "Date"])
+        articles = iter_article_records(articlesDf)
 
-    for citationKey, article in articlesDf.iterrows():
-        modelsReportedInArticle = process_article(citationKey, article)
-        if modelsReportedInArticle:
-            listOfModelsFromArticle.extend(modelsReportedInArticle)
-            nbArticlesProcessed += 1
-        else:
-            raise ValueError(f"{y}(SKIPPED){e}: {b}{citationKey}{e} did not report any model.") # Should not happen, errors are raised earlier, but ... you never know 😅
+    # Main processing loop
+    if args.stream_chunks:
+        datapointsStore, citationKeys = extract_datapoints_streaming(articles, ChunkedStore(args.stream_chunks))
+        # The extraction ran with bounded memory, only the --output Dataframe is built in memory
+        allModelsDF, nbArticlesProcessed = load_datapoints_chunks(datapointsStore, citationKeys), len(citationKeys)
+    elif args.vectorized:
+        # Imported here: vectorized_extraction imports this module
+        from vectorized_extraction import extract_datapoints_vectorized
+        allModelsDF, nbArticlesProcessed, events = extract_datapoints_vectorized(articlesDf)
+        diagnostics.record_events(events)
+    elif args.cache:
+        with DatapointsCache(args.cache) as cache:
+            listOfModelsFromArticle, nbArticlesProcessed, errors = extract_datapoints_incremental(articlesDf, cache, args.jobs)
+            print(f"Datapoints cache: {cache}.")
+    elif args.jobs > 1:
+        listOfModelsFromArticle, nbArticlesProcessed, errors = extract_datapoints_parallel(articlesDf, args.jobs)
+    else:
+        listOfModelsFromArticle, nbArticlesProcessed = extract_datapoints_sequential(articlesDf)
+    if args.jobs > 1:
+        print_error_report(errors, args.error_report)
 
     # Create the DataFrame
-    allModelsDF = pd.DataFrame(listOfModelsFromArticle)
+    if not (args.stream_chunks or args.vectorized):
+        allModelsDF = pd.DataFrame(listOfModelsFromArticle)
     print(f"A total of {r}{len(allModelsDF)}{e} models were extracted from the {b}{nbArticlesProcessed}{e} processed articles.")
-    allModelsDF.to_pickle(allDatapointsPath)
+    # Parses of the model tags in this process (the worker processes of --jobs have their own cache)
+    descriptorCacheInfo = parse_model_descriptor.cache_info()
+    if descriptorCacheInfo.hits + descriptorCacheInfo.misses:
+        diagnostics.info(lambda: f"Model tags: {b}{descriptorCacheInfo.misses}{e} parsed, {b}{descriptorCacheInfo.hits}{e} cache hits.")
+
+    # Numeric columns of the metrics, in a single unit each
+    if not allModelsDF.empty:
+        allModelsDF = add_numeric_metric_columns(allModelsDF)
+        for citationKey, model, unparsedMetrics in allModelsDF.loc[allModelsDF["Unparsed metrics"] != "", ["BBT Citation Key", "Model", "Unparsed metrics"]].itertuples(index=False):
+            for metric in unparsedMetrics.split(", "):
+                diagnostics.warn("Non-numeric metric", citationKey, detail=metric)
+            diagnostics.info(lambda: f"{r}Warning{e}: Non-numeric {unparsedMetrics} for {b}{model}{e} in {b}{citationKey}{e}, left to NaN in the numeric columns.")
+        # Low-cardinality columns (Board, Task, Dataset, etc.) as categoricals with sorted categories
+        allModelsDF = add_categorical_dtypes(allModelsDF)
+    print_diagnostics_summary(args.diagnostics)
+    save_dataframe(allModelsDF, allDatapointsPath)
     print(f"Dataframe saved at: {allDatapointsPath}.")
     
     log_dataframe(allModelsDF)
@@ -0,0 +1,112 @@
+"""Persistent on-disk cache of the datapoints extracted from each article.
+
+The datapoint rows of each article are stored in a SQLite database, keyed by the BBT Citation Key and a hash of the article content
+used by the extraction (its tags and date) and of the version of the extractor.
+An article only has to be processed again once its tags or date changed, or once the extraction itself changed.
+The articles whose extraction failed are stored too (with their error record and no rows), so that they are not processed again either.
+The warnings recorded while processing each article are stored with it, so that a run reading it from the cache reports the same warnings.
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+def article_content_hash(tags: list[str], date: str, extractorVersion: int) -> str:
+    """Hash of everything the extraction of an article depends on."""
+    content = json.dumps([extractorVersion, list(tags), date], ensure_ascii=False)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class CachedArticle(NamedTuple):
+    """Result of the extraction of an article: its datapoint rows, its error record if it failed (see process_article_safely()),
+    and its warnings ((category, citationKey, detail) events, see Diagnostics)."""
+    datapoints: list[dict]
+    error: Optional[dict] = None
+    events: tuple[tuple, ...] = ()
+
+
+class DatapointsCache:
+    """_summary_
+    SQLite-backed cache of the extraction of each article (see CachedArticle), keyed by (BBT Citation Key, content hash), see article_content_hash().
+    Only the latest content of each article is kept. A database written by a previous version of the cache (other columns) is emptied.
+
+    Args:
+        path (str | Path): Path of the SQLite database (created if needed)
+    """
+
+    COLUMNS = ["citationKey", "contentHash", "datapoints", "error", "events"]
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(self.path)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(articles)")]
+        if columns and columns != self.COLUMNS:
+            self.connection.execute("DROP TABLE articles")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " citationKey TEXT PRIMARY KEY, contentHash TEXT NOT NULL, datapoints TEXT NOT NULL, error TEXT, events TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def get(self, citationKey: str, contentHash: str) -> Optional[CachedArticle]:
+        """Returns the cached extraction of the article with this content, or None (a miss) if it is not cached."""
+        row = self.connection.execute(
+            "SELECT datapoints, error, events FROM articles WHERE citationKey = ? AND contentHash = ?", (citationKey, contentHash)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        datapoints, error, events = row
+        # JSON has no tuples, the events are lists once read back
+        return CachedArticle(json.loads(datapoints), json.loads(error) if error is not None else None, tuple(tuple(event) for event in json.loads(events)))
+
+    def put(self, articles: dict[str, tuple[str, CachedArticle]]):
+        """Stores the extraction of articles ({citationKey: (contentHash, CachedArticle)}), replacing their previous content."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO articles (citationKey, contentHash, datapoints, error, events) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        citationKey, contentHash, json.dumps(article.datapoints, ensure_ascii=False),
+                        json.dumps(article.error, ensure_ascii=False) if article.error is not None else None,
+                        json.dumps(article.events, ensure_ascii=False),
+                    )
+                    for citationKey, (contentHash, article) in articles.items()
+                ],
+            )
+
+    def keep_only(self, citationKeys: list[str]) -> int:
+        """Removes the articles not in citationKeys (e.g., removed from the collection) and returns the number of articles removed."""
+        nbArticles = len(self)
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE keptKeys (citationKey TEXT PRIMARY KEY)")
+            self.connection.executemany("INSERT OR IGNORE INTO keptKeys VALUES (?)", [(key,) for key in citationKeys])
+            self.connection.execute("DELETE FROM articles WHERE citationKey NOT IN (SELECT citationKey FROM keptKeys)")
+            self.connection.execute("DROP TABLE keptKeys")
+        return nbArticles - len(self)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    @property
+    def hitRate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses ({100 * self.hitRate:.1f}% hit rate), {len(self)} articles cached"
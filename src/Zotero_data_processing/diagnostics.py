@@ -0,0 +1,89 @@
+"""Level-gated diagnostics of the datapoints extraction.
+
+Messages are only built when their level is enabled: they can be given as callables (e.g., lambda: f"..."), which are not called otherwise,
+so the extraction does not pay for formatting tags lists or dictionaries it will not print.
+Warnings are also counted per category and per BBT Citation Key, whatever the verbosity, and summarized at the end of a run.
+"""
+import json
+from collections import Counter
+from typing import Callable, Optional, Union
+
+# Verbosity levels (number of -v on the command line)
+NONE = 0
+INFO = 1
+DEBUG = 2
+DATAFRAME = 3
+
+Message = Union[str, Callable[[], str]]
+
+
+class Diagnostics:
+    """_summary_
+    Collector of the log messages and warnings of the extraction.
+
+    Args:
+        verbosity (int, optional): Highest level of the printed messages, from NONE (0) to DATAFRAME (3). Defaults to NONE.
+    """
+
+    def __init__(self, verbosity: int = NONE):
+        self.verbosity = verbosity
+        self.events = []  # (category, citationKey, detail) of the warnings, in order
+
+    def is_enabled(self, level: int) -> bool:
+        return self.verbosity >= level
+
+    def log(self, level: int, message: Message):
+        if self.verbosity >= level:
+            print(message() if callable(message) else message)
+
+    def info(self, message: Message):
+        self.log(INFO, message)
+
+    def debug(self, message: Message):
+        self.log(DEBUG, message)
+
+    def warn(self, category: str, citationKey: str, message: Optional[Message] = None, detail: Optional[str] = None):
+        """_summary_
+        Records a warning and prints its message at the DEBUG level.
+
+        Args:
+            category (str): Category of the warning, e.g., "Missing metric"
+            citationKey (str): BBT Citation Key of the article
+            message (str | Callable[[], str], optional): Message printed at the DEBUG level. Defaults to None.
+            detail (str, optional): Sub-category counted in the summary, e.g., the name of the missing metric. Defaults to None.
+        """
+        self.events.append((category, citationKey, detail))
+        if message is not None:
+            self.debug(message)
+
+    def pop_events(self) -> list[tuple]:
+        """Returns the warnings recorded so far and forgets them, e.g., to send them from a worker process to the main one."""
+        events, self.events = self.events, []
+        return events
+
+    def record_events(self, events: list[tuple]):
+        self.events.extend(events)
+
+    def summary(self) -> dict:
+        """_summary_
+        Machine-readable summary of the warnings.
+
+        Returns:
+            dict: {category: {"count": int, "byCitationKey": {citationKey: int}, "byDetail": {detail: int}}}, "byDetail" only for the categories with details
+        """
+        summary = {}
+        for category, citationKey, detail in self.events:
+            categorySummary = summary.setdefault(category, {"count": 0, "byCitationKey": Counter()})
+            categorySummary["count"] += 1
+            categorySummary["byCitationKey"][citationKey] += 1
+            if detail is not None:
+                categorySummary.setdefault("byDetail", Counter())[detail] += 1
+        for categorySummary in summary.values():
+            categorySummary["byCitationKey"] = dict(categorySummary["byCitationKey"])
+            if "byDetail" in categorySummary:
+                categorySummary["byDetail"] = dict(categorySummary["byDetail"])
+        return summary
+
+    def write_summary(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
@@ -0,0 +1,345 @@
+"""Vectorized extraction of the datapoints of the whole corpus at once, a second engine next to the per-article process_article().
+
+The tags of all the articles are exploded into a single (article, position, tag) table. The tag prefixes are classified with vectorized
+string operations, the "(<modelName>)" qualifiers of the articles reporting several models are resolved by joins with the table of the models,
+and the result is pivoted into the same datapoint rows as process_article(), in the same order.
+Run as a script, it checks that both engines give identical datapoints and warnings on a Dataframe of articles, and times them:
+
+    python ./src/Zotero_data_processing/vectorized_extraction.py -i data/Dataframes/all_articles.pkl
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from create_datapoints_df import (
+    DESIGN_TAG_PREFIXES,
+    LIST_DESIGN_DETAILS,
+    MAIN_INFO_TAG_PREFIXES,
+    METRIC_TAG_PREFIXES,
+    VALID_LATENCY_UNITS,
+    diagnostics,
+    extract_datapoints_sequential,
+    get_hardcoded_articles,
+    parse_string_parentheses_braces,
+)
+from utils.dataframes import load_dataframe
+from utils.imports import lazy_import
+from utils.utils import extract_years_from_strings, parse_strings_parentheses_braces
+
+# Imported on first use, see utils/imports.py
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+MAIN_INFO_COLUMNS = [
+    "BBT Citation Key", "Model", "Equivalent model", "Backbone", "Modality", "Dataset", "Task", "Application", "Board", "Implementation",
+    "Publication year",
+]
+# Metrics whose unit is checked by extract_metrics(), and the check of a non-empty value
+UNIT_CHECKS = {
+    "Latency": lambda values: ~values.str.endswith(tuple(VALID_LATENCY_UNITS)),
+    "FPS": lambda values: ~values.str.endswith("FPS"),
+    "Frequency": lambda values: ~values.str.endswith("MHz"),
+}
+
+
+def explode_tags(articlesDf) -> pd.DataFrame:
+    """_summary_
+    Explodes the tags of all the articles into a single table, keeping only the tags with an extracted prefix.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+
+    Returns:
+        pd.DataFrame: One row per tag, in the order of the articles and of their tags, with "article" (position of the article in articlesDf),
+                      "position" (of the tag in its article), "prefix" and "content" (stripped). For the contents written "(<qualifier>) <value>",
+                      "qualifier" and "value" (stripped, NaN otherwise). "isUnqualified" flags the contents not starting with "(".
+    """
+    tags = articlesDf["Tags"].reset_index(drop=True).explode().dropna()
+    tagsDf = pd.DataFrame({"article": tags.index.to_numpy(), "tag": tags.array})
+    tagsDf["position"] = tagsDf.groupby("article").cumcount()
+
+    extractedPrefixes = (*MAIN_INFO_TAG_PREFIXES.values(), *METRIC_TAG_PREFIXES.values(), *DESIGN_TAG_PREFIXES.values())
+    tagsDf = tagsDf[tagsDf["tag"].str.startswith(extractedPrefixes)].reset_index(drop=True)
+
+    # The prefix ends at the first ": ", the tags are sliced once per length of prefix (a handful) rather than matched one by one
+    prefixLengths = tagsDf["tag"].str.find(": ").to_numpy() + 2
+    slicedTags = []
+    for prefixLength in np.unique(prefixLengths):
+        lengthTags = tagsDf["tag"][prefixLengths == prefixLength]
+        slicedTags.append(pd.DataFrame({"prefix": lengthTags.str.slice(0, prefixLength), "content": lengthTags.str.slice(prefixLength)}))
+    slicedTags = pd.concat(slicedTags).reindex(tagsDf.index)
+    tagsDf["prefix"] = slicedTags["prefix"]
+    tagsDf["content"] = slicedTags["content"].str.strip()
+
+    # "(<qualifier>) <value>": split at the first ")", a content without it has neither a qualifier nor a value
+    tagsDf["isUnqualified"] = ~tagsDf["content"].str.startswith("(")
+    qualifiedContents = tagsDf.loc[~tagsDf["isUnqualified"], "content"]
+    qualifiedParts = qualifiedContents.str.slice(1).str.split(")", n=1, expand=True).reindex(columns=[0, 1])
+    qualifiedParts = qualifiedParts[qualifiedContents.str.contains(")", regex=False)]
+    tagsDf["qualifier"] = qualifiedParts[0].str.strip()
+    tagsDf["value"] = qualifiedParts[1].str.strip()
+    return tagsDf.drop(columns="tag")
+
+
+def nth_content(tagsDf, tagPrefix: str, articles, indices) -> np.ndarray:
+    """Contents of the indices-th tag with this prefix of the articles (aligned arrays), NaN where the article has no such tag."""
+    prefixTags = tagsDf[tagsDf["prefix"] == tagPrefix]
+    contents = prefixTags.set_index([prefixTags["article"], prefixTags.groupby("article").cumcount()])["content"]
+    return contents.reindex(pd.MultiIndex.from_arrays([articles, indices])).to_numpy(dtype=object)
+
+
+def get_models_table(articlesDf, tagsDf, errors: dict) -> pd.DataFrame:
+    """_summary_
+    Vectorized main information of process_article(): one row per model, in the order of the articles and of their "Model: " tags.
+    The articles that process_article() would reject are recorded in errors ({article: message}) and their models are left out.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+        tagsDf (pd.DataFrame): Their tags, see explode_tags()
+        errors (dict): Where to record the errors
+
+    Returns:
+        pd.DataFrame: The columns of MAIN_INFO_COLUMNS, with "article", "modelIndex", "nbModels",
+                      and the number of "Board: ", "Implementation: " and "Modality: " tags of the article (for the warnings)
+    """
+    citationKeys = articlesDf.index.to_numpy(dtype=object)
+    articlePositions = pd.RangeIndex(len(articlesDf))
+
+    def count_tags(key) -> pd.Series:
+        return tagsDf.loc[tagsDf["prefix"] == MAIN_INFO_TAG_PREFIXES[key], "article"].value_counts().reindex(articlePositions, fill_value=0)
+
+    def reject(articles, message):
+        for article in articles:
+            errors.setdefault(article, f"{citationKeys[article]}: {message}")
+
+    modelTags = tagsDf[(tagsDf["prefix"] == MAIN_INFO_TAG_PREFIXES["Models"]) & (tagsDf["content"] != "N/A")]
+    models = pd.DataFrame({
+        "article": modelTags["article"].to_numpy(),
+        "modelIndex": modelTags.groupby("article").cumcount().to_numpy(),
+        "modelTag": modelTags["content"].to_numpy(dtype=object),
+    })
+    nbTags = {key: count_tags(key) for key in ["Board", "Implementation", "Modality", "Datasets", "Tasks"]}
+    nbModels = models["article"].value_counts().reindex(articlePositions, fill_value=0)
+    models["nbModels"] = nbModels.reindex(models["article"]).to_numpy()
+    models["BBT Citation Key"] = citationKeys[models["article"]]
+    for key in ["Board", "Implementation", "Modality"]:
+        models[f"nb{key}"] = nbTags[key].reindex(models["article"]).to_numpy()
+
+    # Checks of check_article_validity()
+    reject(articlePositions[nbTags["Board"] > 1], "has multiple boards.")
+    reject(articlePositions[nbTags["Modality"] > 1], "has multiple modalities.")
+    reject(models.loc[models["modelTag"] == "???", "article"].unique(), "has unspecified models.")
+
+    # Model names, with the error of parse_string_parentheses_braces() for the malformed ones
+    modelNames, malformed = parse_strings_parentheses_braces(models["modelTag"], columns=["Model", "Equivalent model", "Backbone"])
+    models[["Model", "Equivalent model", "Backbone"]] = modelNames
+    for modelTag in models.loc[malformed, "modelTag"].unique():
+        try:
+            parse_string_parentheses_braces(modelTag)
+        except ValueError as error:
+            reject(models.loc[models["modelTag"] == modelTag, "article"].unique(), str(error))
+
+    # A single dataset and task for all the models of an article, or one per model
+    for key, column in [("Datasets", "Dataset"), ("Tasks", "taskTag")]:
+        nbArticleTags = nbTags[key].reindex(models["article"]).to_numpy()
+        indices = np.where(nbArticleTags == 1, 0, models["modelIndex"])
+        models[column] = nth_content(tagsDf, MAIN_INFO_TAG_PREFIXES[key], models["article"], indices)
+        models.loc[(nbArticleTags != 1) & (nbArticleTags != models["nbModels"]), column] = np.nan
+    taskParts = models["taskTag"].str.split("(")
+    models["Task"] = taskParts.str[0].str.strip()
+    models["Application"] = taskParts.str[1].str[:-1].str.strip()
+
+    # Articles with overridden datasets, tasks and applications
+    specificInfos = [
+        get_hardcoded_articles(citationKey, modelName) if isinstance(modelName, str) else None
+        for citationKey, modelName in zip(models["BBT Citation Key"], models["Model"])
+    ]
+    isSpecific = np.array([specificInfo is not None for specificInfo in specificInfos], dtype=bool)
+    for column in ["Dataset", "Task", "Application"]:
+        models.loc[isSpecific, column] = [specificInfo[column] for specificInfo in specificInfos if specificInfo is not None]
+
+    for key in ["Modality", "Board", "Implementation"]:
+        models[key] = nth_content(tagsDf, MAIN_INFO_TAG_PREFIXES[key], models["article"], np.zeros(len(models), dtype=int))
+    years, _ = extract_years_from_strings(articlesDf["Date"].reset_index(drop=True))
+    models["Publication year"] = years.reindex(models["article"]).to_numpy()
+
+    for column, message in [
+        ("Dataset", "Missing dataset for model"),
+        ("Application", "Missing task/application for model"),
+        ("Modality", "Missing modality for model"),
+        ("Board", "Missing board for model"),
+        ("Implementation", "Missing implementation for model"),
+        ("Publication year", "No year found in the date for model"),
+    ]:
+        for article, modelName in models.loc[models[column].isna(), ["article", "Model"]].itertuples(index=False):
+            reject([article], f"{message} {modelName}")
+    reject(articlePositions[nbModels == 0], "did not report any model.")
+
+    models = models[~models["article"].isin(list(errors))].reset_index(drop=True)
+    models["Publication year"] = models["Publication year"].astype("int64")
+    return models
+
+
+def get_candidate_values(models, tagsDf, tagPrefixes: list[str], unqualifiedPrefixes: list[str]) -> pd.DataFrame:
+    """_summary_
+    Resolves the tags of the given prefixes that apply to each model: all of them for the articles reporting a single model, and,
+    for the articles reporting several models, those qualified by the name or the backbone of the model ("<prefix>(<modelName>) <value>"),
+    plus the unqualified ones for the prefixes of unqualifiedPrefixes (see ArticleTagIndex.model_values()).
+
+    Returns:
+        pd.DataFrame: One row per (model, tag) with "row" (of the model in models), "prefix", "position" and "value", sorted by model and position
+    """
+    tagsDf = tagsDf[tagsDf["prefix"].isin(tagPrefixes)]
+    models = models.reset_index(names="row")
+    isSingleModel = models["nbModels"] == 1
+
+    # Articles reporting a single model: the whole content of the tags
+    single = models.loc[isSingleModel, ["row", "article"]].merge(tagsDf[["article", "prefix", "position", "content"]], on="article")
+
+    # Articles reporting several models: the qualified tags, joined on (article, qualifier) with the name and the backbone of each model
+    severalModels = models.loc[~isSingleModel]
+    modelQualifiers = pd.concat([
+        severalModels[["row", "article", "Model"]].rename(columns={"Model": "qualifier"}),
+        severalModels[["row", "article", "Backbone"]].rename(columns={"Backbone": "qualifier"}),
+    ]).drop_duplicates()
+    qualified = modelQualifiers.merge(
+        tagsDf.loc[tagsDf["qualifier"].notna(), ["article", "qualifier", "prefix", "position", "value"]], on=["article", "qualifier"]
+    )
+    unqualified = severalModels[["row", "article"]].merge(
+        tagsDf.loc[tagsDf["isUnqualified"] & tagsDf["prefix"].isin(unqualifiedPrefixes), ["article", "prefix", "position", "content"]], on="article"
+    )
+
+    candidates = pd.concat([
+        single.rename(columns={"content": "value"}), qualified, unqualified.rename(columns={"content": "value"})
+    ])[["row", "prefix", "position", "value"]]
+    return candidates.sort_values(["row", "position"], kind="stable").reset_index(drop=True)
+
+
+def extract_metrics_vectorized(models, tagsDf) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """_summary_
+    Vectorized extract_metrics(): the first tag of each metric that applies to the model, "" if it is missing or "N/A".
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The metrics (one column per metric of METRIC_TAG_PREFIXES, aligned with models), and the mask of the metrics found
+    """
+    candidates = get_candidate_values(models, tagsDf, list(METRIC_TAG_PREFIXES.values()), [METRIC_TAG_PREFIXES["Frequency"]])
+    firstValues = candidates.groupby(["row", "prefix"])["value"].first().unstack("prefix")
+    firstValues = firstValues.reindex(index=models.index, columns=list(METRIC_TAG_PREFIXES.values()))
+    firstValues.columns = list(METRIC_TAG_PREFIXES)
+
+    metrics = pd.DataFrame(index=models.index)
+    for metric in METRIC_TAG_PREFIXES:
+        values = firstValues[metric]
+        metrics[metric] = values.where(~values.str.startswith("N/A").fillna(False).astype(bool), "").fillna("").to_numpy(dtype=object)
+    return metrics, firstValues.notna()
+
+
+def extract_accelerator_design_vectorized(models, tagsDf) -> pd.DataFrame:
+    """Vectorized extract_accelerator_design(): the last tag of each detail that applies to the model (""), or all of them as a list for LIST_DESIGN_DETAILS ([])."""
+    candidates = get_candidate_values(models, tagsDf, list(DESIGN_TAG_PREFIXES.values()), list(DESIGN_TAG_PREFIXES.values()))
+    lastValues = candidates.groupby(["row", "prefix"])["value"].last().unstack("prefix")
+    lastValues = lastValues.reindex(index=models.index, columns=list(DESIGN_TAG_PREFIXES.values()))
+    lastValues.columns = list(DESIGN_TAG_PREFIXES)
+
+    design = pd.DataFrame(index=models.index)
+    for key, tagPrefix in DESIGN_TAG_PREFIXES.items():
+        if key in LIST_DESIGN_DETAILS:
+            # Comma-separated items of all the tags, in order
+            items = candidates.loc[candidates["prefix"] == tagPrefix].set_index("row")["value"].str.split(",").explode().str.strip()
+            lists = [[] for _ in range(len(models))]
+            for row, item in zip(items.index, items):
+                lists[row].append(item)
+            design[key] = lists
+        else:
+            design[key] = lastValues[key].fillna("").to_numpy(dtype=object)
+    return design
+
+
+def get_warning_events(models, metrics, metricsFound) -> list[tuple]:
+    """Warnings of the extraction (see Diagnostics.warn()), in the order in which process_article() records them."""
+    eventTables = []
+    firstModels = models[models["modelIndex"] == 0]
+    for order, key in enumerate(["Board", "Implementation", "Modality"]):
+        articles = firstModels[firstModels[f"nb{key}"] > 1]
+        eventTables.append(pd.DataFrame({
+            "article": articles["article"], "modelIndex": -1, "order": order, "category": f"Multiple {key.lower()}s",
+            "citationKey": articles["BBT Citation Key"], "detail": None,
+        }))
+    for order, metric in enumerate(METRIC_TAG_PREFIXES):
+        if metric in UNIT_CHECKS:
+            warned = models[metrics[metric].ne("") & UNIT_CHECKS[metric](metrics[metric].astype(str))]
+            eventTables.append(pd.DataFrame({
+                "article": warned["article"], "modelIndex": warned["modelIndex"], "order": order, "category": "Unit",
+                "citationKey": warned["BBT Citation Key"], "detail": metric,
+            }))
+    for order, metric in enumerate(METRIC_TAG_PREFIXES, start=len(METRIC_TAG_PREFIXES)):
+        missing = models[~metricsFound[metric]]
+        eventTables.append(pd.DataFrame({
+            "article": missing["article"], "modelIndex": missing["modelIndex"], "order": order, "category": "Missing metric",
+            "citationKey": missing["BBT Citation Key"], "detail": metric,
+        }))
+    events = pd.concat(eventTables).sort_values(["article", "modelIndex", "order"], kind="stable")
+    return [
+        (category, citationKey, detail if isinstance(detail, str) else None)
+        for category, citationKey, detail in events[["category", "citationKey", "detail"]].itertuples(index=False)
+    ]
+
+
+def extract_datapoints_vectorized(articlesDf) -> tuple[pd.DataFrame, int, list[tuple]]:
+    """_summary_
+    Extracts the datapoints of all the articles at once, with vectorized operations on the table of all their tags.
+    The datapoints are identical to those of extract_datapoints_sequential(), as a DataFrame.
+
+    Args:
+        articlesDf (pd.DataFrame): The articles, indexed by their BBT Citation Key
+
+    Raises:
+        ValueError: If some articles are badly tagged or did not report any model (all of them are listed)
+
+    Returns:
+        tuple[pd.DataFrame, int, list[tuple]]: The datapoints, the number of articles processed, and the warnings (to give to Diagnostics.record_events())
+    """
+    tagsDf = explode_tags(articlesDf)
+    errors = {}
+    models = get_models_table(articlesDf, tagsDf, errors)
+    if errors:
+        raise ValueError(f"{len(errors)} articles can't be processed:\n" + "\n".join(f"- {errors[article]}" for article in sorted(errors)))
+
+    metrics, metricsFound = extract_metrics_vectorized(models, tagsDf)
+    design = extract_accelerator_design_vectorized(models, tagsDf)
+    datapointsDf = pd.concat([models[MAIN_INFO_COLUMNS], metrics, design], axis=1)
+    # Same dtypes as a DataFrame built from the rows of process_article()
+    for column in datapointsDf.columns.difference(["Publication year", *LIST_DESIGN_DETAILS], sort=False):
+        datapointsDf[column] = datapointsDf[column].astype(str)
+    return datapointsDf, len(articlesDf), get_warning_events(models, metrics, metricsFound)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks that the vectorized extraction gives the same datapoints as the per-article extraction.")
+    parser.add_argument("--input", "-i", type=str, required=True, help="Path of the input Dataframe with the articles.")
+    args = parser.parse_args()
+
+    articlesDf = load_dataframe(args.input, columns=["Tags", "Date"])
+
+    startTime = time.perf_counter()
+    listOfModelsFromArticle, _ = extract_datapoints_sequential(articlesDf)
+    sequentialDf = pd.DataFrame(listOfModelsFromArticle)
+    sequentialTime = time.perf_counter() - startTime
+    sequentialEvents = diagnostics.pop_events()
+
+    startTime = time.perf_counter()
+    vectorizedDf, _, vectorizedEvents = extract_datapoints_vectorized(articlesDf)
+    vectorizedTime = time.perf_counter() - startTime
+
+    print(f"{len(articlesDf)} articles, {len(sequentialDf)} datapoints.")
+    print(f"Per-article extraction: {sequentialTime * 1e3:.1f} ms, vectorized extraction: {vectorizedTime * 1e3:.1f} ms.")
+    sameDatapoints = vectorizedDf.equals(sequentialDf)
+    sameWarnings = vectorizedEvents == sequentialEvents
+    print(f"Identical datapoints: {sameDatapoints}, identical warnings: {sameWarnings} ({len(sequentialEvents)} warnings).")
+    if not sameDatapoints:
+        differentColumns = [column for column in sequentialDf.columns if not vectorizedDf[column].equals(sequentialDf[column])] \
+            if list(vectorizedDf.columns) == list(sequentialDf.columns) else "the columns differ"
+        print(f"Different columns: {differentColumns}")
+    sys.exit(0 if sameDatapoints and sameWarnings else 1)
@@ -0,0 +1,245 @@
+"""Asyncio fetch engine for the Zotero web API.
+
+pyzotero sends one blocking request at a time. This engine sends the requests for the listing pages and the item payloads concurrently
+(up to a configurable limit), while respecting the "Backoff" and "Retry-After" headers of the Zotero API and retrying transient failures.
+It only relies on the standard library (the blocking HTTP calls run in threads), and the endpoint can be set to a local stand-in server.
+"""
+import asyncio
+import json
+import random
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ZOTERO_API_ENDPOINT = "https://api.zotero.org"
+# The Zotero API returns at most 100 items per listing page, and accepts at most 50 keys in "itemKey"
+MAX_ITEMS_PER_PAGE = 100
+MAX_KEYS_PER_REQUEST = 50
+# HTTP status codes worth retrying (429 and 503 usually come with a "Retry-After" header)
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ListingConsistencyError(ValueError):
+    pass
+
+
+def check_listing_consistency(items: list, totalResults: int, pageVersions: list[int]):
+    """_summary_
+    Checks a listing fetched by concurrent pages. If the library is modified during the listing, the items can shift between
+    the pages ("start" offsets), and some items are then listed twice while others are missing.
+
+    Args:
+        items (list): The items of all the pages
+        totalResults (int): The "Total-Results" header of the first page
+        pageVersions (list[int]): The "Last-Modified-Version" header of each page
+
+    Raises:
+        ListingConsistencyError: If the library version changed between pages, or if items are duplicated or missing
+    """
+    keys = [item["key"] for item in items]
+    nbDuplicates = len(keys) - len(set(keys))
+    nbMissing = totalResults - len(set(keys))
+    if len(set(pageVersions)) > 1 or nbDuplicates or nbMissing:
+        raise ListingConsistencyError(
+            f"The library was modified during the listing (versions {sorted(set(pageVersions))}): "
+            f"{nbDuplicates} duplicated and {nbMissing} missing items out of {totalResults}, please list again."
+        )
+
+
+class FetchStats:
+    """Throughput counters of an AsyncZoteroFetcher."""
+
+    def __init__(self):
+        self.startTime = time.monotonic()
+        self.nbRequests = 0
+        self.nbItems = 0
+        self.nbRetries = 0
+        self.backoffTime = 0.0  # Time spent waiting because of "Backoff" or "Retry-After" headers, summed over all requests, in s
+
+    @property
+    def elapsedTime(self) -> float:
+        return time.monotonic() - self.startTime
+
+    @property
+    def requestsPerSecond(self) -> float:
+        return self.nbRequests / self.elapsedTime
+
+    @property
+    def itemsPerSecond(self) -> float:
+        return self.nbItems / self.elapsedTime
+
+    def __str__(self):
+        return (
+            f"{self.nbRequests} requests ({self.requestsPerSecond:.1f} req/s), {self.nbItems} items ({self.itemsPerSecond:.1f} items/s), "
+            f"{self.nbRetries} retries, {self.backoffTime:.1f}s of cumulated backoff in {self.elapsedTime:.1f}s"
+        )
+
+
+class TransientHTTPError(Exception):
+    def __init__(self, message: str, retryAfter: float = 0.0):
+        super().__init__(message)
+        self.retryAfter = retryAfter
+
+
+class AsyncZoteroFetcher:
+    """_summary_
+    Fetches Zotero listing pages and item payloads concurrently with asyncio.
+
+    At most `concurrency` requests are in flight at once. A "Backoff" header (sent by the server when it is overloaded) or a "Retry-After" header
+    (sent with 429 and 503 responses) pauses all requests for the given duration. Transient failures (5xx, 429, network errors) are retried
+    up to `maxRetries` times, with an exponential delay and full jitter.
+
+    Args:
+        libraryID (str): ID of the Zotero library
+        libraryType (str): "group" or "user"
+        apiKey (str, optional): Zotero API key. Defaults to None (public libraries).
+        endpoint (str, optional): Base URL of the API, e.g., a local stand-in server for testing. Defaults to ZOTERO_API_ENDPOINT.
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 8.
+        maxRetries (int, optional): Maximum number of retries per request. Defaults to 5.
+        retryBaseDelay (float, optional): Base of the exponential retry delay, in s. Defaults to 1.
+        timeout (float, optional): Timeout of each request, in s. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        libraryID: str,
+        libraryType: str,
+        apiKey: str = None,
+        endpoint: str = ZOTERO_API_ENDPOINT,
+        concurrency: int = 8,
+        maxRetries: int = 5,
+        retryBaseDelay: float = 1.0,
+        timeout: float = 30.0,
+    ):
+        if concurrency < 1:
+            raise ValueError(f"concurrency should be at least 1, got {concurrency}.")
+        self.libraryPrefix = f"{endpoint.rstrip('/')}/{libraryType}s/{libraryID}"
+        self.headers = {"Zotero-API-Version": "3"}
+        if apiKey:
+            self.headers["Zotero-API-Key"] = apiKey
+        self.concurrency = concurrency
+        self.maxRetries = maxRetries
+        self.retryBaseDelay = retryBaseDelay
+        self.timeout = timeout
+        self.stats = FetchStats()
+        self._backoffUntil = 0.0
+        self._semaphore = None
+        self._semaphoreLoop = None
+
+    def _get(self, url: str) -> tuple[object, dict]:
+        """Blocking GET request, run in a thread by _request()."""
+        request = urllib.request.Request(url, headers=self.headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                # Keep the HTTPMessage, its header lookups are case-insensitive
+                return json.loads(response.read()), response.headers
+        except urllib.error.HTTPError as error:
+            if error.code in TRANSIENT_STATUS_CODES:
+                retryAfter = float(error.headers.get("Retry-After", 0) or 0)
+                raise TransientHTTPError(f"HTTP {error.code} for {url}", retryAfter) from error
+            raise
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as error:
+            raise TransientHTTPError(f"{error} for {url}") from error
+
+    def _set_backoff(self, duration: float):
+        self._backoffUntil = max(self._backoffUntil, time.monotonic() + duration)
+
+    async def _wait_backoff(self):
+        remainder = self._backoffUntil - time.monotonic()
+        if remainder > 0:
+            self.stats.backoffTime += remainder
+            await asyncio.sleep(remainder)
+
+    async def _request(self, path: str, params: dict) -> tuple[object, dict]:
+        """_summary_
+        Sends a GET request to the library, waiting for any active backoff and retrying transient failures.
+
+        Raises:
+            TransientHTTPError: If the request still fails after maxRetries retries
+            urllib.error.HTTPError: For non-transient HTTP errors (e.g., 403 or 404)
+
+        Returns:
+            tuple[object, dict]: The decoded JSON response and the response headers
+        """
+        # The semaphore is bound to the event loop, a new one is needed for each asyncio.run()
+        if self._semaphoreLoop is not asyncio.get_running_loop():
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphoreLoop = asyncio.get_running_loop()
+        url = f"{self.libraryPrefix}{path}?{urllib.parse.urlencode(params)}"
+
+        for attempt in range(self.maxRetries + 1):
+            async with self._semaphore:
+                await self._wait_backoff()
+                try:
+                    self.stats.nbRequests += 1
+                    content, headers = await asyncio.to_thread(self._get, url)
+                except TransientHTTPError as error:
+                    if attempt == self.maxRetries:
+                        raise
+                    self.stats.nbRetries += 1
+                    if error.retryAfter:
+                        self._set_backoff(error.retryAfter)
+                    delay = random.uniform(0, self.retryBaseDelay * 2**attempt)
+                else:
+                    if "Backoff" in headers:
+                        self._set_backoff(float(headers["Backoff"]))
+                    return content, headers
+            # Sleep outside of the semaphore, so that other requests can go on
+            await asyncio.sleep(delay)
+
+    async def fetch_listing(self, path: str, params: dict = None) -> list:
+        """_summary_
+        Fetches all the items of a listing (e.g., "/collections/<key>/items"). The first page gives the "Total-Results" header,
+        the remaining pages are then requested concurrently with the "start" parameter, see check_listing_consistency().
+
+        Args:
+            path (str): Path of the listing, relative to the library
+            params (dict, optional): Additional URL parameters (e.g., itemType). Defaults to None.
+
+        Returns:
+            list: The items of the listing, in the order of the pages
+        """
+        params = {"format": "json", "limit": MAX_ITEMS_PER_PAGE} | (params or {})
+        firstPage, headers = await self._request(path, params | {"start": 0})
+        totalResults = int(headers.get("Total-Results", len(firstPage)))
+
+        otherPages = await asyncio.gather(
+            *[self._request(path, params | {"start": start}) for start in range(MAX_ITEMS_PER_PAGE, totalResults, MAX_ITEMS_PER_PAGE)]
+        )
+        items = list(firstPage)
+        pageVersions = [int(headers.get("Last-Modified-Version", 0))]
+        for page, pageHeaders in otherPages:
+            items.extend(page)
+            pageVersions.append(int(pageHeaders.get("Last-Modified-Version", 0)))
+        self.stats.nbItems += len(items)
+
+        check_listing_consistency(items, totalResults, pageVersions)
+        return items
+
+    async def fetch_collection_items(self, collectionKey: str, params: dict = None) -> list:
+        return await self.fetch_listing(f"/collections/{collectionKey}/items", params)
+
+    async def fetch_items_data(self, keys: list[str], batchSize: int = MAX_KEYS_PER_REQUEST) -> list[dict]:
+        """_summary_
+        Fetches the "data" payloads of the items with the given keys, by concurrent batches of keys ("itemKey" parameter).
+
+        Raises:
+            ValueError: If batchSize is not in [1, 50], or if some keys were not returned by the API
+
+        Returns:
+            list[dict]: The "data" payloads, in the order of keys
+        """
+        if not 1 <= batchSize <= MAX_KEYS_PER_REQUEST:
+            raise ValueError(f"batchSize should be between 1 and {MAX_KEYS_PER_REQUEST}, got {batchSize}.")
+        batches = [keys[i:i + batchSize] for i in range(0, len(keys), batchSize)]
+        responses = await asyncio.gather(
+            *[self._request("/items", {"format": "json", "itemKey": ",".join(batch), "limit": len(batch)}) for batch in batches]
+        )
+        itemsData = {item["data"]["key"]: item["data"] for items, _ in responses for item in items}
+        self.stats.nbItems += len(itemsData)
+
+        missingKeys = [key for key in keys if key not in itemsData]
+        if missingKeys:
+            raise ValueError(f"{len(missingKeys)} items were not returned by the Zotero API: {missingKeys}")
+        return [itemsData[key] for key in keys]
@@ -0,0 +1,98 @@
+"""Persistent on-disk cache of Zotero item payloads.
+
+The raw "data" payload of each item is stored in a SQLite database, keyed by the item key and its version.
+An item only has to be downloaded again once its version changed in Zotero.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class ZoteroItemCache:
+    """_summary_
+    SQLite-backed cache of Zotero item "data" payloads, keyed by (item key, item version). Only the latest version of each item is kept.
+
+    Eviction policy (applied by evict(), called when the cache is closed):
+    - Entries not accessed for more than maxAge seconds are removed.
+    - If there are more than maxEntries entries, the least recently accessed are removed.
+
+    Args:
+        path (str | Path): Path of the SQLite database (created if needed)
+        maxEntries (int, optional): Maximum number of items kept. Defaults to None (no limit).
+        maxAge (float, optional): Maximum time since the last access of an item, in s. Defaults to None (no limit).
+    """
+
+    def __init__(self, path, maxEntries: Optional[int] = None, maxAge: Optional[float] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.maxEntries = maxEntries
+        self.maxAge = maxAge
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " key TEXT NOT NULL, version INTEGER NOT NULL, data TEXT NOT NULL, lastAccess REAL NOT NULL,"
+            " PRIMARY KEY (key, version))"
+        )
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def get(self, key: str, version: int) -> Optional[dict]:
+        """Returns the cached "data" payload of the item at this version, or None (a miss) if it is not cached."""
+        row = self.connection.execute("SELECT data FROM items WHERE key = ? AND version = ?", (key, version)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE items SET lastAccess = ? WHERE key = ? AND version = ?", (time.time(), key, version))
+        return json.loads(row[0])
+
+    def put(self, itemsData: list[dict]):
+        """Stores "data" payloads (each with its "key" and "version"), replacing the previous versions of these items."""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany("DELETE FROM items WHERE key = ?", [(data["key"],) for data in itemsData])
+            self.connection.executemany(
+                "INSERT INTO items (key, version, data, lastAccess) VALUES (?, ?, ?, ?)",
+                [(data["key"], data["version"], json.dumps(data), now) for data in itemsData],
+            )
+
+    def all_items_data(self) -> list[dict]:
+        """Returns all the cached "data" payloads, e.g., to build the DataFrame offline."""
+        return [json.loads(row[0]) for row in self.connection.execute("SELECT data FROM items ORDER BY rowid")]
+
+    def evict(self) -> int:
+        """Applies the eviction policy and returns the number of items removed."""
+        nbItems = len(self)
+        with self.connection:
+            if self.maxAge is not None:
+                self.connection.execute("DELETE FROM items WHERE lastAccess < ?", (time.time() - self.maxAge,))
+            if self.maxEntries is not None:
+                self.connection.execute(
+                    "DELETE FROM items WHERE rowid NOT IN (SELECT rowid FROM items ORDER BY lastAccess DESC LIMIT ?)",
+                    (self.maxEntries,),
+                )
+        return nbItems - len(self)
+
+    def close(self):
+        self.evict()
+        self.connection.commit()
+        self.connection.close()
+
+    @property
+    def hitRate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses ({100 * self.hitRate:.1f}% hit rate), {len(self)} items cached"
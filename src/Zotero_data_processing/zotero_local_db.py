@@ -0,0 +1,114 @@
+"""Reads the items of a collection directly from the database of the Zotero desktop client (zotero.sqlite).
+
+The items are rebuilt in the same shape as the web API items ({"key", "version", "data"}), so that they go through the same
+filter_screened_articles() and extract_article_data() as the items downloaded from the API.
+"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+# Fields of the "data" payload used by extract_article_data()
+ARTICLE_FIELDS = ["title", "DOI", "url", "abstractNote", "date", "citationKey", "extra"]
+
+# Items of the collection (not in the trash), most recently modified first like the web API listing.
+# groupID is optional: collection keys are only unique within a library.
+SELECTED_ITEMS_CTE = """
+WITH selected AS (
+    SELECT items.itemID, items.key, items.version, itemTypesCombined.typeName AS itemType, items.dateModified
+    FROM collections
+    JOIN collectionItems USING (collectionID)
+    JOIN items USING (itemID)
+    JOIN itemTypesCombined USING (itemTypeID)
+    LEFT JOIN groups ON groups.libraryID = collections.libraryID
+    WHERE collections.key = :collectionKey
+      AND (:groupID IS NULL OR groups.groupID = :groupID)
+      AND itemTypesCombined.typeName IN ({itemTypes})
+      AND items.itemID NOT IN (SELECT itemID FROM deletedItems)
+)
+"""
+
+
+def connect_read_only(dbPath) -> sqlite3.Connection:
+    # "immutable" skips file locking: the Zotero client keeps zotero.sqlite locked while it is running.
+    # /!\ The client should then not write to the database during the read, close it or work on a copy to be safe.
+    return sqlite3.connect(f"{Path(dbPath).resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+
+
+def sqlite_date_to_api_date(value: str) -> str:
+    # Zotero stores dates as "<SQL date> <original string>", e.g., "2021-06-00 2021-06", the API only returns the original string
+    if len(value) > 11 and value[4] == "-" and value[7] == "-" and value[10] == " ":
+        return value[11:]
+    return value
+
+
+def get_all_articles_in_local_collection(
+    dbPath, collectionKey: str, itemTypes: list[str], groupID: Optional[int] = None
+) -> list:
+    """_summary_
+    Local equivalent of get_all_articles_in_collection(): reads the items of a collection from zotero.sqlite with a few bulk SQL joins
+    (one for the items, one for their fields, one for their authors and one for their tags).
+
+    Args:
+        dbPath (str | Path): Path of the zotero.sqlite database, opened read-only
+        collectionKey (str): Key of the Zotero collection
+        itemTypes (list[str]): Item types to select, e.g., ["conferencePaper", "journalArticle", "bookSection"]
+        groupID (int, optional): ID of the group library of the collection. Defaults to None (any library).
+
+    Returns:
+        list: The items, in the same shape as the web API items ({"key", "version", "data"})
+    """
+    itemTypesParams = {f"itemType{i}": itemType for i, itemType in enumerate(itemTypes)}
+    cte = SELECTED_ITEMS_CTE.format(itemTypes=", ".join(f":{name}" for name in itemTypesParams))
+    params = {"collectionKey": collectionKey, "groupID": groupID} | itemTypesParams
+
+    with closing(connect_read_only(dbPath)) as connection:
+        itemsData = {}
+        for itemID, key, version, itemType in connection.execute(
+            cte + "SELECT itemID, key, version, itemType FROM selected ORDER BY dateModified DESC, key", params
+        ):
+            itemsData[itemID] = {"key": key, "version": version, "itemType": itemType, "creators": [], "tags": []}
+
+        for itemID, fieldName, value in connection.execute(
+            cte + f"""
+            SELECT itemData.itemID, fieldsCombined.fieldName, itemDataValues.value
+            FROM selected
+            JOIN itemData USING (itemID)
+            JOIN fieldsCombined USING (fieldID)
+            JOIN itemDataValues USING (valueID)
+            WHERE fieldsCombined.fieldName IN ({", ".join(f"'{f}'" for f in ARTICLE_FIELDS)})
+            """,
+            params,
+        ):
+            itemsData[itemID][fieldName] = sqlite_date_to_api_date(value) if fieldName == "date" else value
+
+        for itemID, creatorType, firstName, lastName, fieldMode in connection.execute(
+            cte + """
+            SELECT itemCreators.itemID, creatorTypes.creatorType, creators.firstName, creators.lastName, creators.fieldMode
+            FROM selected
+            JOIN itemCreators USING (itemID)
+            JOIN creators USING (creatorID)
+            JOIN creatorTypes USING (creatorTypeID)
+            ORDER BY itemCreators.itemID, itemCreators.orderIndex
+            """,
+            params,
+        ):
+            # Single-field creators (fieldMode 1, e.g., "IEEE") only have a "name" in the API
+            if fieldMode == 1:
+                itemsData[itemID]["creators"].append({"creatorType": creatorType, "name": lastName})
+            else:
+                itemsData[itemID]["creators"].append({"creatorType": creatorType, "firstName": firstName, "lastName": lastName})
+
+        for itemID, tag in connection.execute(
+            cte + """
+            SELECT itemTags.itemID, tags.name
+            FROM selected
+            JOIN itemTags USING (itemID)
+            JOIN tags USING (tagID)
+            ORDER BY itemTags.itemID, tags.name
+            """,
+            params,
+        ):
+            itemsData[itemID]["tags"].append({"tag": tag})
+
+    return [{"key": data["key"], "version": data["version"], "data": data} for data in itemsData.values()]
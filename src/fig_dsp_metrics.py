@@ -1,30 +1,20 @@
 #!/usr/bin/python3
 import numpy as np
-import pickle
 import re
 import matplotlib.pyplot as plt
-from utils.metadata import *
+from utils.metadata import fpga_part_catalog
+from utils.utils import add_numeric_metric_columns
+from utils.dataframes import load_dataframe
 
-with open("../data/Dataframes/all_articles_2025-06-01_12-33-03.pkl", "rb") as f:
-    raw_data = pickle.load(f)
+# all_datapoints.parquet if it exists (and pyarrow is installed), all_datapoints.pkl otherwise
+data = load_dataframe("../data/Dataframes/all_datapoints")
+# Dataframes created before the numeric metric columns
+if "Power consumption [W]" not in data.columns:
+    data = add_numeric_metric_columns(data)
 
-with open("../data/Dataframes/all_datapoints.pkl", "rb") as f:
-    data = pickle.load(f)
 
 
 
-
-def get_part(board_str):
-    tag =  board_str.split("(")[0]
-    board = board_str.split("{")[1].split("}")[0]
-    part = board_str.split("(")[1].split(")")[0]
-    if(board.endswith("KV260")):
-        part = "XCK26"
-    return part
-
-def get_num(part):
-    return fpga_part_info[part][1]
-
 def findN(str_in, key):
     res = re.search(r"\d+%\s*" + key, str_in)
     if res == None:
@@ -48,13 +38,6 @@ def get_max_util(t):
         return dd
     return max(dd,bb)
 
-def get_first(t):
-    v = t.split(" ")[0]
-    try:
-        return float(v)
-    except:
-        return "-"
-
 def get_total_dsp(inp):
     print(inp)
     if(inp["dsp_util"] == '-'):
@@ -62,14 +45,16 @@ def get_total_dsp(inp):
     total = inp["dsp_util"]*inp["dsp"]*0.01
     return int(total)
 
-data["Board"] = data["Board"].apply(get_part)
-data["dsp"] = data["Board"].apply(get_num)
+# Part, year, DSP count and family of the boards (see fpga_part_catalog)
+data = fpga_part_catalog.add_part_columns(data)
+data["Board"] = data["FPGA part"]
+data["dsp"] = data["FPGA DSP"]
 data["dsp_util"] = data["FPGA Util"].apply(get_bram_util)
 data["bram_util"] = data["FPGA Util"].apply(get_dsp_util)
 data["max_util"] = data["FPGA Util"].apply(get_max_util)
-data["Power consumption"] = data["Power consumption"].apply(get_first)
-data["Throughput"] = data["Throughput"].apply(get_first)
-data["Footprint"] = data["Footprint"].apply(get_first)
+data["Power consumption"] = data["Power consumption [W]"].astype(object).fillna("-")
+data["Throughput"] = data["Throughput [GOP/s]"].astype(object).fillna("-")
+data["Footprint"] = data["Footprint [MB]"].astype(object).fillna("-")
 
 data["num_dsp"] = data.apply(get_total_dsp,axis=1)
 
@@ -80,23 +65,7 @@ data["num_dsp"] = data.apply(get_total_dsp,axis=1)
 
 
 
-def replace_comp(val):
-    if val == "" or val == "O(n) OP":
-        return 0
-    val = val.split(" ")[0]
-    fac = val[-1]
-    v = float(val[:-1])
-    if fac == 'K':
-        ret = v*1024
-    elif fac == 'M':
-        ret = v*1024*1024
-    elif fac == 'G':
-        ret = v*1024*1024*1024
-    else:
-        ret = 0
-    return ret
-
-data["Complexity"]= (data["Complexity"].apply(replace_comp))
+data["Complexity"] = data["Complexity [OP]"].fillna(0)
 
 print(data["Complexity"].unique())
 
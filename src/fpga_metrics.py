@@ -1,13 +1,17 @@
 #!/usr/bin/python3
 import numpy as np
-import pickle
 import re
-
-with open("../data/Dataframes/all_articles_2025-06-01_12-33-03.pkl", "rb") as f:
-    raw_data = pickle.load(f)
-
-with open("../data/Dataframes/all_datapoints.pkl", "rb") as f:
-    data = pickle.load(f)
+from utils.utils import add_numeric_metric_columns, add_categorical_dtypes, remove_categorical_dtypes
+from utils.dataframes import load_dataframe
+
+# all_datapoints.parquet if it exists (and pyarrow is installed), all_datapoints.pkl otherwise
+data = load_dataframe("../data/Dataframes/all_datapoints")
+# Dataframes created before the numeric metric columns
+if "Footprint [MB]" not in data.columns:
+    data = add_numeric_metric_columns(data)
+# Dataframes created before the categorical columns
+if data["Board"].dtype != "category":
+    data = add_categorical_dtypes(data)
 
 ### Table
 # Memory, Implementation, Task, Footprint, Utilization
@@ -117,6 +121,9 @@ print(f"Num CNNs: {num_cnn} CNNs percentage of manual implementations({num_cnn /
 
 
 ##### Measure the average memory of off-chip vs on-chip #####
+# Design and Memory are rewritten below: back to strings, a categorical only accepts its categories as values
+data = remove_categorical_dtypes(data, ["Design", "Memory"])
+
 # Add various kernels to all Vitis AI stuff
 df = data.loc[data["Implementation"].isin(impl_tags["Vitis AI"])]
 df["Design"] = df["Design"].replace("", "Various Kernels")
@@ -154,15 +161,8 @@ spec_off = data.loc[
 print(f"Number Flexible {(flex_total)}: Avg Off-Chip: {(flex_off) / (flex_total)}")
 print(f"Number Specific {(spec_total)}: Avg Off-Chip: {(spec_off) / (spec_total)}")
 
-off_chip = data.loc[(data["Memory"] == "Off-chip") & (data["Footprint"] != "")][
-    "Footprint"
-].to_list()
-on_chip = data.loc[(data["Memory"] == "On-chip") & (data["Footprint"] != "")][
-    "Footprint"
-].to_list()
-
-off_chip = [float(x.split(" ")[0]) for x in off_chip]
-on_chip = [float(x.split(" ")[0]) for x in on_chip]
+off_chip = data.loc[data["Memory"] == "Off-chip", "Footprint [MB]"].dropna().to_list()
+on_chip = data.loc[data["Memory"] == "On-chip", "Footprint [MB]"].dropna().to_list()
 print(f"Number Off-chip {len(off_chip)}: Avg Memory Footprint: {sum(off_chip) / len(off_chip)} MB")
 print(f"Number On-chip {len(on_chip)}: Avg Memory Footprint: {sum(on_chip) / len(on_chip)} MB")
 
@@ -1,9 +1,11 @@
 """This file is responsible for generating the FPGA taxonomy (Table 3). It groups different experiments and outputs the latex table."""
 
 #!/usr/bin/python3
-import pickle
 import re
 from pathlib import Path
+from utils.utils import add_numeric_metric_columns, add_categorical_dtypes, remove_categorical_dtypes
+from utils.dataframes import load_dataframe
+from utils.metadata import resolve_board_part
 
 # Check if the tags is a array if one of the keys is there otherwise print the last dictionary entry
 def check_array(tags, tdict):
@@ -160,11 +162,16 @@ class TexColumn:
 
 
 # ##### Load Data #####
-# with open("../data/Dataframes/all_articles_2025-06-01_12-33-03.pkl", "rb") as f:
-#     raw_data = pickle.load(f)
+# raw_data = load_dataframe("../data/Dataframes/all_articles_2025-06-01_12-33-03")
 
-with open("../data/Dataframes/all_datapoints.pkl", "rb") as f:
-    data = pickle.load(f)
+# all_datapoints.parquet if it exists (and pyarrow is installed), all_datapoints.pkl otherwise
+data = load_dataframe("../data/Dataframes/all_datapoints")
+# Dataframes created before the numeric metric columns
+if "Power consumption [W]" not in data.columns:
+    data = add_numeric_metric_columns(data)
+# Dataframes created before the categorical columns
+if data["Board"].dtype != "category":
+    data = add_categorical_dtypes(data)
 
 print(data.columns)
 
@@ -295,25 +302,8 @@ fps_tags = {f.split(" ")[0]: [f] for f in data["FPS"].unique()}
 
 board_tags = {}
 for f in sorted(data["Board"].unique()):
-    tag = f.split("(")[0]
-
-    ss = tag.split(" ")
-    ls = tag.split("-")
-    k = tag[0]
-    if ss[1] != "":
-        if ss[1] == "7000":
-            k += "7"
-        else:
-            k += ss[1]
-    elif len(ls) > 1:
-        k += ls[1]
-    else:
-        k = "Alveo"
-
-    board = f.split("{")[1].split("}")[0]
-    part = f.split("(")[1].split(")")[0]
-
-    k = part.split("XC")[-1]
+    # Grouped by part, without the "XC" prefix (e.g., "7Z020"), see resolve_board_part() for the boards reporting another part
+    k = resolve_board_part(f).split("XC")[-1]
 
     if k in board_tags.keys():
         board_tags[k].append(f)
@@ -369,6 +359,9 @@ em_tags = {
 }
 
 
+# Design and Memory are rewritten below: back to strings, a categorical only accepts its categories as values
+data = remove_categorical_dtypes(data, ["Design", "Memory"])
+
 # Add various kernels to all Vitis AI stuff
 df = data.loc[data["Implementation"].isin(impl_tags["Vitis AI"])]
 df["Design"] = df["Design"].replace("", "Various Kernels")
@@ -384,13 +377,8 @@ data.loc[data["Implementation"].isin(impl_tags["Vitis AI"])] = df
 
 
 # Calculate Power Efficiency
-for i, r in data.iterrows():
-    pc = r["Power consumption"].split(" ")[0]
-    tp = r["Throughput"].split(" ")[0]
-    if (pc != "") and (tp != ""):
-        data.loc[i, "Power efficiency"] = "{:.1f}".format(float(tp) / float(pc))
-    else:
-        data.loc[i, "Power efficiency"] = ""
+powerEfficiency = data["Throughput [GOP/s]"] / data["Power consumption [W]"]
+data["Power efficiency"] = powerEfficiency.map("{:.1f}".format).where(powerEfficiency.notna(), "")
 
 eff_tags = {x: [x] for x in data["Power efficiency"].unique()}
 
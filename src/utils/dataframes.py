@@ -0,0 +1,100 @@
+"""Saving and loading of the articles and datapoints Dataframes, as Parquet or pickle files.
+
+Parquet is a columnar format: list columns (e.g., "Tags", "List", "Optimizations") are stored as proper lists, repeated strings are
+dictionary-encoded, and a subset of the columns can be read without deserializing the others (e.g., the abstracts).
+It requires pyarrow, an optional dependency (pip install pyarrow): without it, the Dataframes are saved and loaded as pickle files.
+"""
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+from typing import Optional
+
+from utils.imports import lazy_import
+
+# Imported on first use, see utils/imports.py
+pd = lazy_import("pandas")
+
+PARQUET_SUFFIX = ".parquet"
+PICKLE_SUFFIX = ".pkl"
+
+
+def is_parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def resolve_dataframe_path(path) -> Path:
+    """_summary_
+    Picks the file of a Dataframe. A path with a ".parquet" or ".pkl" suffix is used as is. Otherwise (e.g., "data/Dataframes/all_datapoints"),
+    the Parquet file is used if it exists and pyarrow is installed, and the pickle file otherwise.
+
+    Args:
+        path (str | Path): Path of the Dataframe, with or without suffix
+
+    Returns:
+        Path: Path of the file to read
+    """
+    path = Path(path)
+    if path.suffix in (PARQUET_SUFFIX, PICKLE_SUFFIX):
+        return path
+    parquetPath = path.with_name(path.name + PARQUET_SUFFIX)
+    if parquetPath.exists() and is_parquet_available():
+        return parquetPath
+    return path.with_name(path.name + PICKLE_SUFFIX)
+
+
+def check_parquet_available(path: Path):
+    if not is_parquet_available():
+        raise ValueError(f"{path} is a Parquet file, which requires pyarrow (pip install pyarrow). Use a {PICKLE_SUFFIX} file instead.")
+
+
+def save_dataframe(df: pd.DataFrame, path):
+    """_summary_
+    Saves a Dataframe (with its index), as a Parquet file if the path ends with ".parquet", as a pickle file otherwise.
+
+    Args:
+        df (pd.DataFrame): The Dataframe to save
+        path (str | Path): Output path
+
+    Raises:
+        ValueError: If the path ends with ".parquet" but pyarrow is not installed
+    """
+    path = Path(path)
+    if path.suffix == PARQUET_SUFFIX:
+        check_parquet_available(path)
+        # Dictionary encoding is pyarrow's default for all columns, the repeated strings are stored once per column chunk
+        df.to_parquet(path, engine="pyarrow", index=True)
+    else:
+        df.to_pickle(path)
+
+
+def load_dataframe(path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """_summary_
+    Loads a Dataframe saved by save_dataframe() (or any pickled Dataframe), see resolve_dataframe_path() for the choice of the file.
+
+    Args:
+        path (str | Path): Path of the Dataframe, with or without suffix
+        columns (list[str], optional): Columns to load (the index is always loaded). With Parquet, the other columns are not read at all.
+                                       Defaults to None (all columns).
+
+    Raises:
+        ValueError: If the file is a Parquet file but pyarrow is not installed
+
+    Returns:
+        pd.DataFrame: The Dataframe
+    """
+    path = resolve_dataframe_path(path)
+    if path.suffix == PARQUET_SUFFIX:
+        check_parquet_available(path)
+        import pyarrow.parquet as pq
+        import pyarrow.types
+
+        table = pq.read_table(path, columns=columns, use_pandas_metadata=True)
+        df = table.to_pandas()
+        # pyarrow converts the list columns to numpy arrays, the pickled Dataframes have Python lists
+        for field in table.schema:
+            if pyarrow.types.is_list(field.type) and field.name in df.columns:
+                df[field.name] = [values.tolist() if values is not None else None for values in df[field.name]]
+        return df
+    df = pd.read_pickle(path)
+    return df if columns is None else df[columns]
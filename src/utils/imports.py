@@ -0,0 +1,37 @@
+"""Deferred imports of the heavy packages (pandas, numpy), so that the scripts start fast, e.g., for --help.
+
+    pd = lazy_import("pandas")
+
+pd is a placeholder module: pandas is only executed on the first access to one of its attributes (e.g., pd.DataFrame).
+The modules using it add "from __future__ import annotations", so that their type annotations (e.g., -> pd.DataFrame) are not evaluated.
+See benchmark_startup.py for the import time of each entry point.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """_summary_
+    Imports a top-level package lazily (see importlib.util.LazyLoader): its code is only executed on the first access to one of its attributes.
+
+    Args:
+        name (str): Name of the package, e.g., "pandas"
+
+    Raises:
+        ValueError: If the package is not installed
+
+    Returns:
+        ModuleType: The module, already imported or lazily imported
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ValueError(f"{name} is not installed.")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
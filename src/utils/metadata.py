@@ -1,3 +1,8 @@
+import bisect
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 plot_colors: dict[str, str] = {
     "mpl_blue": "#1f77b4",  # Default matplotlib blue
     "blue_1":   "#2066a8",  # Blues
@@ -70,13 +75,151 @@ fpga_part_info = {
     "5CSEMA5F31C6"  : [2012,  87,    "Cyclone"]  # Terasic DE-01 board (Link: https://mm.digikey.com/Volume0/opasdata/d220001/medias/docus/607/Cyclone_V_Device_Overview_Web.pdf (page 13 (A5)
 }
 
+class FpgaPart(NamedTuple):
+    """Entry of the FPGA part catalog, see fpga_part_info."""
+    part: str
+    year: int
+    dsp: int
+    family: str
+
+# Parts of the boards whose tag reports another part, by suffix of the board name (e.g., "Zynq US+ (XCZU19EG) {KV260}")
+board_part_overrides = {
+    "KV260": "XCK26",
+}
+
+class FpgaPartCatalog:
+    """_summary_
+    The FPGA parts of fpga_part_info, indexed by part, family, year and DSP count.
+
+    Args:
+        part_info (dict[str, list]): {part: [year, DSP count, family]}, see fpga_part_info
+    """
+
+    def __init__(self, part_info: dict[str, list]):
+        self.by_part = {part: FpgaPart(part, year, dsp, family) for part, (year, dsp, family) in part_info.items()}
+        self.by_family = {}
+        self.by_year = {}
+        for entry in self.by_part.values():
+            self.by_family.setdefault(entry.family, []).append(entry)
+            self.by_year.setdefault(entry.year, []).append(entry)
+        self.by_dsp = sorted(self.by_part.values(), key=lambda entry: entry.dsp)
+        self.dsp_counts = [entry.dsp for entry in self.by_dsp]
+
+    def __contains__(self, part: str) -> bool:
+        return part in self.by_part
+
+    def __getitem__(self, part: str) -> FpgaPart:
+        return self.by_part[part]
+
+    def get(self, part: str) -> Optional[FpgaPart]:
+        return self.by_part.get(part)
+
+    def family(self, family: str) -> list[FpgaPart]:
+        return self.by_family.get(family, [])
+
+    def year(self, year: int) -> list[FpgaPart]:
+        return self.by_year.get(year, [])
+
+    def dsp_between(self, min_dsp: int, max_dsp: int) -> list[FpgaPart]:
+        """Parts with min_dsp <= DSP count <= max_dsp, by increasing DSP count."""
+        return self.by_dsp[bisect.bisect_left(self.dsp_counts, min_dsp):bisect.bisect_right(self.dsp_counts, max_dsp)]
+
+    def add_part_columns(self, df, board_column: str = "Board"):
+        """_summary_
+        Adds the "FPGA part", "FPGA year", "FPGA DSP" and "FPGA family" columns of the boards of a datapoints Dataframe,
+        by mapping the distinct board tags (see resolve_board_part()). They are NaN for the parts missing from the catalog.
+
+        Args:
+            df (pd.DataFrame): The datapoints
+            board_column (str, optional): Column of the board tags, "Family (PART) {Board}". Defaults to "Board".
+
+        Returns:
+            pd.DataFrame: A copy of df with the added columns
+        """
+        boardTags = df[board_column].astype(object)
+        boards = boardTags.drop_duplicates()
+        parts = [resolve_board_part(board) for board in boards]
+        entries = [self.get(part) for part in parts]
+        partColumns = {
+            "FPGA part": parts,
+            "FPGA year": [entry.year if entry else None for entry in entries],
+            "FPGA DSP": [entry.dsp if entry else None for entry in entries],
+            "FPGA family": [entry.family if entry else None for entry in entries],
+        }
+        df = df.copy()
+        for column, values in partColumns.items():
+            df[column] = boardTags.map(dict(zip(boards, values)))
+        return df
+
+@lru_cache(maxsize=None)
+def resolve_board_part(board_tag: str) -> str:
+    """_summary_
+    Part of a board tag "Family (PART) {Board}", e.g., "XC7Z020" for "Zynq 7000 (XC7Z020) {PYNQ-Z1}", with the board_part_overrides.
+    Memoized: a Dataframe only has a few dozen distinct board tags.
+
+    Args:
+        board_tag (str): The board tag
+
+    Raises:
+        ValueError: If the tag does not have the part in parentheses and the board in braces
+
+    Returns:
+        str: The part, which may be missing from fpga_part_catalog
+    """
+    match = re.fullmatch(r"[^(]*\((?P<part>[^)]*)\)[^{]*\{(?P<board>[^}]*)\}.*", board_tag, re.DOTALL)
+    if match is None:
+        raise ValueError(f'Board tag "{board_tag}" is not "Family (PART) {{Board}}".')
+    for board_suffix, part in board_part_overrides.items():
+        if match["board"].endswith(board_suffix):
+            return part
+    return match["part"]
+
+def resolve_board(board_tag: str) -> Optional[FpgaPart]:
+    """Catalog entry of the part of a board tag (see resolve_board_part()), None if the part is missing from fpga_part_catalog."""
+    return fpga_part_catalog.get(resolve_board_part(board_tag))
+
+fpga_part_catalog = FpgaPartCatalog(fpga_part_info)
+
+def classify_model_core(combined_info: str):
+    """Model core of an upper-cased "<Model> <Equivalent model> <Backbone>" string (see model_core_pattern), None if no keyword matches."""
+    match = model_core_pattern.match(combined_info)
+    return model_core_labels[match.lastgroup] if match else None
+
 def assign_model_core(row):
     # Combine the values from the three columns
     combined_info = f"{row['Model']} {row['Equivalent model']} {row['Backbone']}".upper()
-    for keyword, core_label in model_core_map.items():
-        if keyword.upper() in combined_info:
-            return core_label
-    raise ValueError(f"Model core not found for row: {row}")
+    core_label = classify_model_core(combined_info)
+    if core_label is None:
+        raise ValueError(f"Model core not found for row: {row}")
+    return core_label
+
+def assign_model_cores(df):
+    """_summary_
+    Vectorized assign_model_core(): model cores of all the rows of a datapoints Dataframe at once.
+    Each distinct (Model, Equivalent model, Backbone) triple is classified once, and the rows without a model core are reported together.
+
+    Args:
+        df (pd.DataFrame): The datapoints, with the "Model", "Equivalent model" and "Backbone" columns
+
+    Raises:
+        ValueError: If some rows match no keyword of model_core_map, with all their triples
+
+    Returns:
+        pd.Series: The model cores, with the index of df
+    """
+    columns = ["Model", "Equivalent model", "Backbone"]
+    triples = df[columns].astype(object)
+    distinct_triples = list(triples.drop_duplicates().itertuples(index=False, name=None))
+    # Same string as assign_model_core() for each distinct triple, NaN included ("nan")
+    distinct_cores = [classify_model_core(f"{model} {equivalent} {backbone}".upper()) for model, equivalent, backbone in distinct_triples]
+    # Groups numbered in order of first appearance, as drop_duplicates()
+    model_cores = triples.groupby(columns, dropna=False, sort=False).ngroup().map(dict(enumerate(distinct_cores)))
+
+    unmatched = [triple for triple, core_label in zip(distinct_triples, distinct_cores) if core_label is None]
+    if unmatched:
+        raise ValueError(f"Model core not found for {model_cores.isna().sum()} rows, with these (Model, Equivalent model, Backbone):\n- "
+                         + "\n- ".join(str(triple) for triple in unmatched))
+    return model_cores
 
 def rename_application(app: str) -> str:
     if app == "Safe UAV landing site identification":
@@ -126,4 +269,12 @@ model_core_map = {
 
     # Not enough information
     'CNN': 'Custom CNN',
-}
\ No newline at end of file
+}
+
+# model_core_map compiled into a single regex: one lookahead per keyword, tried in the order of the map, so that the first keyword found
+# anywhere in the string wins as with a linear scan (a plain alternation would pick the leftmost keyword in the string instead).
+# The group name of the matched lookahead gives the label.
+model_core_labels = {f"keyword{i}": core_label for i, core_label in enumerate(model_core_map.values())}
+model_core_pattern = re.compile(
+    "|".join(f"(?=.*?(?P<keyword{i}>{re.escape(keyword.upper())}))" for i, keyword in enumerate(model_core_map)), re.DOTALL
+)
@@ -1,5 +1,6 @@
 import re
-import tabulate
+from functools import lru_cache
+from typing import NamedTuple
 
 # Quick ANSI color code shortcuts
 r = "\033[31m"
@@ -33,6 +34,8 @@ def wrap_label(label, maxWidth=15):
     return wrapped
 
 def print_pretty_df(df, max_rows=-1):
+    import tabulate  # Only imported to print
+
     if max_rows == -1:
         max_rows = len(df)
     print(
@@ -141,6 +144,216 @@ def parse_string_parentheses_braces(
 
     return str1, str2, str3
 
+class ModelDescriptor(NamedTuple):
+    """Parsed "Model: " tag "<name> (<equivalent>) {<backbone>}", see parse_model_descriptor()."""
+    name: str
+    equivalent: str
+    backbone: str
+
+@lru_cache(maxsize=1024)
+def parse_model_descriptor(fullTagModelName: str) -> ModelDescriptor:
+    """_summary_
+    Cached parse_string_parentheses_braces() of a model tag: the extraction parses each model tag several times
+    (process_article(), extract_metrics() and extract_accelerator_design()), only the first one is parsed.
+    The descriptor is immutable, so it can be shared. See parse_model_descriptor.cache_info() for the hits and misses.
+
+    Args:
+        fullTagModelName (str): The model tag, "<name> (<equivalent>) {<backbone>}"
+
+    Raises:
+        ValueError: if Parentheses or Braces are missing in fullTagModelName (not cached)
+
+    Returns:
+        ModelDescriptor: The name, equivalent model and backbone
+    """
+    return ModelDescriptor(*parse_string_parentheses_braces(fullTagModelName))
+
+# Column-level equivalents of the parsers above, for whole Series at once (e.g., the dates or the "Model: " tags of all the articles).
+# Malformed entries are reported in a boolean mask rather than raising a ValueError, their parsed values are NaN.
+
+def parse_distinct_strings(strings, parser):
+    """_summary_
+    Applies a column-level parser once per distinct string (e.g., a few hundred distinct dates or model tags for thousands of rows),
+    and broadcasts the result back to all the rows. Missing strings are parsed as "".
+
+    Args:
+        strings (pd.Series): The strings to parse
+        parser (Callable[[pd.Series], pd.Series | pd.DataFrame]): Parses a Series of distinct strings, keeping its index
+
+    Returns:
+        pd.Series | pd.DataFrame: The output of parser, one row per row of strings (same index)
+    """
+    codes, distinctStrings = strings.fillna("").factorize()
+    parsed = parser(distinctStrings.astype(str).to_series().reset_index(drop=True))
+    return parsed.take(codes).set_axis(strings.index)
+
+def extract_years_from_strings(dateStrings):
+    """_summary_
+    Column-level extract_year_from_string(): extracts the year of each date, as the first 4-digit number of the string.
+
+    Args:
+        dateStrings (pd.Series): The dates in string format
+
+    Returns:
+        tuple[pd.Series, pd.Series]: The years (Int64, NA where there is none), and the boolean mask of the dates without a year
+                                     (extract_year_from_string() would raise a ValueError), including the missing dates
+    """
+    def parse_years(dates):
+        # str.replace() rather than str.extract(), which is much slower with the pyarrow-backed strings
+        return dates.str.replace(r"(?s)^.*?(\d{4}).*$", r"\1", regex=True).where(dates.str.contains(r"\d{4}"))
+
+    years = parse_distinct_strings(dateStrings, parse_years)
+    noYear = years.isna()
+    return years.astype("Int64"), noYear
+
+def parse_strings_parentheses_braces(originalStrings, defaultToStr1: bool = False, columns: list[str] = ["str1", "str2", "str3"]):
+    """_summary_
+    Column-level parse_string_parentheses_braces(): parses a Series of strings in the format "str1 (str2) {str3}" into 3 columns.
+    Each component is the same as with parse_string_parentheses_braces(), including for the strings without parentheses or braces.
+
+    Args:
+        originalStrings (pd.Series): originalStrings = "str1 (str2) {str3}"
+        defaultToStr1 (bool, optional): Sets str2 and str3 to str1 if empty. Defaults to False.
+        columns (list[str], optional): Names of the 3 columns. Defaults to ["str1", "str2", "str3"].
+
+    Returns:
+        tuple[pd.DataFrame, pd.Series]: The 3 components (same index as originalStrings), and the boolean mask of the malformed strings
+                                        (parse_string_parentheses_braces() would raise a ValueError as parentheses or braces are missing),
+                                        including the missing strings. The components of the malformed strings are NaN.
+    """
+    def parse_components(strings):
+        parStart = strings.str.find("(")
+        parEnd = strings.str.find(")")
+        braceStart = strings.str.find("{")
+        braceEnd = strings.str.find("}")
+        malformed = ((parStart == -1) != (parEnd == -1)) | ((braceStart == -1) != (braceEnd == -1))
+
+        # Without parentheses (or braces), find() returns -1 for both, and the slices of parse_string_parentheses_braces() are [:-1]
+        withoutLastChar = strings.str.slice(0, -1)
+        str1 = strings.str.replace(r"(?s)^([^(]*)\(.*$", r"\1", regex=True).where(parStart != -1, withoutLastChar)
+        # The slice between the first "(" and the first ")" is empty if the latter comes first
+        str2 = strings.str.replace(r"(?s)^[^(]*\(([^)]*)\).*$", r"\1", regex=True).where(parEnd > parStart, "").where(parStart != -1, withoutLastChar)
+        str3 = strings.str.replace(r"(?s)^[^{]*\{([^}]*)\}.*$", r"\1", regex=True).where(braceEnd > braceStart, "").where(braceStart != -1, withoutLastChar)
+
+        components = str1.str.strip().to_frame(columns[0])
+        components[columns[1]] = str2.str.strip()
+        components[columns[2]] = str3.str.strip()
+        if defaultToStr1:
+            for column in columns[1:]:
+                components[column] = components[column].mask(components[column] == "", components[columns[0]])
+        components["malformed"] = malformed
+        return components
+
+    components = parse_distinct_strings(originalStrings, parse_components)
+    malformed = components.pop("malformed") | originalStrings.isna()
+    return components.mask(malformed), malformed
+
+# Float64 companion columns of the metric columns of the datapoints (raw strings such as "12.3 ms", "45 FPS" or "4.04G OP"),
+# each normalized to a single unit. The units are written without spaces ("4.04G OP" is parsed as "4.04GOP"), with their scale to that unit.
+NUMERIC_METRICS = {
+    "Latency": ("Latency [s]", {"s": 1.0, "ms": 1e-3, "us": 1e-6, "µs": 1e-6, "ns": 1e-9}),
+    "FPS": ("FPS [1/s]", {"FPS": 1.0}),
+    "Throughput": ("Throughput [GOP/s]", {"TOP/s": 1e3, "GOP/s": 1.0, "MOP/s": 1e-3}),
+    "Power consumption": ("Power consumption [W]", {"W": 1.0, "mW": 1e-3}),
+    "Frequency": ("Frequency [MHz]", {"GHz": 1e3, "MHz": 1.0, "kHz": 1e-3}),
+    "Complexity": ("Complexity [OP]", {"OP": 1.0, "KOP": 1e3, "MOP": 1e6, "GOP": 1e9, "TOP": 1e12}),
+    "Footprint": ("Footprint [MB]", {"B": 1e-6, "KB": 1e-3, "MB": 1.0, "GB": 1e3}),
+}
+# "<value><unit>" with an optional trailing "*" marker (e.g., the latency of a single pixel for segmentation)
+QUANTITY_PATTERN = r"^(?P<value>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?P<unit>[^*]*?)(?P<marker>\*?)$"
+
+def parse_quantities(rawValues, unitScales: dict[str, float], allowMarker: bool = False):
+    """_summary_
+    Parses a Series of quantities written as strings (e.g., "12.3 ms", "4.5W" or "0.097 ms*") into floats in a single unit, with vectorized string operations.
+    Empty strings are missing values (NaN), but not unparsed ones.
+
+    Args:
+        rawValues (pd.Series): The quantities as strings
+        unitScales (dict[str, float]): The accepted units (without spaces) and their scale to the target unit, e.g., {"s": 1.0, "ms": 1e-3}
+        allowMarker (bool, optional): Accepts a trailing "*" marker, otherwise a quantity with a marker is unparsed. Defaults to False.
+
+    Returns:
+        tuple[pd.Series, pd.Series, pd.Series]: The float64 values (NaN if empty or unparsed), the boolean mask of the quantities with a "*" marker,
+                                                and the boolean mask of the non-empty quantities that could not be parsed
+    """
+    compactValues = rawValues.fillna("").astype(str).str.replace(r"\s+", "", regex=True)
+    parts = compactValues.str.extract(QUANTITY_PATTERN)
+    markers = parts["marker"].eq("*")
+    scales = parts["unit"].map(unitScales)
+    if not allowMarker:
+        scales = scales.where(~markers)
+    values = (parts["value"].astype(float) * scales).astype("float64")
+    unparsed = compactValues.ne("") & values.isna()
+    return values, markers & ~unparsed, unparsed
+
+def add_numeric_metric_columns(datapointsDf):
+    """_summary_
+    Adds the float64 companion columns of the metrics (see NUMERIC_METRICS) to a datapoints Dataframe, so that the analyses do not parse the strings again:
+    "Latency [s]", "FPS [1/s]", "Throughput [GOP/s]", "Power consumption [W]", "Frequency [MHz]", "Complexity [OP]" and "Footprint [MB]".
+    Two flag columns are also added: "Latency per pixel" (the "*" marker of the latencies of a single pixel),
+    and "Unparsed metrics" (comma-separated names of the metrics whose non-empty value could not be parsed, e.g., "O(n) OP").
+
+    Args:
+        datapointsDf (pd.DataFrame): The datapoints, with the raw metric columns
+
+    Returns:
+        pd.DataFrame: A copy of datapointsDf with the added columns
+    """
+    datapointsDf = datapointsDf.copy()
+    unparsedMetrics = None
+    for metric, (numericColumn, unitScales) in NUMERIC_METRICS.items():
+        values, markers, unparsed = parse_quantities(datapointsDf[metric], unitScales, allowMarker=(metric == "Latency"))
+        datapointsDf[numericColumn] = values
+        if metric == "Latency":
+            datapointsDf["Latency per pixel"] = markers
+        unparsedName = unparsed.map({True: f"{metric}, ", False: ""})
+        unparsedMetrics = unparsedName if unparsedMetrics is None else unparsedMetrics + unparsedName
+    datapointsDf["Unparsed metrics"] = unparsedMetrics.str.removesuffix(", ")
+    return datapointsDf
+
+# Low-cardinality columns of the datapoints (a few dozen distinct strings each), stored as categoricals
+CATEGORICAL_COLUMNS = ["Board", "Implementation", "Modality", "Task", "Application", "Dataset", "Design", "Memory", "Precision"]
+
+def add_categorical_dtypes(datapointsDf, columns: list[str] = CATEGORICAL_COLUMNS):
+    """_summary_
+    Converts the low-cardinality columns of a datapoints Dataframe to categoricals: each distinct string is stored once, and the rows
+    only hold integer codes, so that isin(), == and groupby() compare integers instead of strings.
+    The categories are the sorted distinct values: they do not depend on the order of the articles, and sorting by a column
+    gives the same order as with strings.
+    A categorical only accepts its categories as values: rename values after remove_categorical_dtypes(),
+    and group with groupby(..., observed=True) (the unobserved categories of a subset would otherwise get empty groups).
+
+    Args:
+        datapointsDf (pd.DataFrame): The datapoints
+        columns (list[str], optional): The columns to convert, those missing from datapointsDf are ignored. Defaults to CATEGORICAL_COLUMNS.
+
+    Returns:
+        pd.DataFrame: A copy of datapointsDf with the categorical columns
+    """
+    datapointsDf = datapointsDf.copy()
+    for column in columns:
+        if column in datapointsDf.columns:
+            values = datapointsDf[column].astype("category")
+            datapointsDf[column] = values.cat.reorder_categories(sorted(values.cat.categories))
+    return datapointsDf
+
+def remove_categorical_dtypes(datapointsDf, columns: list[str] = CATEGORICAL_COLUMNS):
+    """_summary_
+    Converts categorical columns back to strings (the dtype of their categories), see add_categorical_dtypes().
+
+    Args:
+        datapointsDf (pd.DataFrame): The datapoints
+        columns (list[str], optional): The columns to convert, those missing or not categorical are ignored. Defaults to CATEGORICAL_COLUMNS.
+
+    Returns:
+        pd.DataFrame: A copy of datapointsDf without the categorical columns
+    """
+    datapointsDf = datapointsDf.copy()
+    for column in columns:
+        if column in datapointsDf.columns and datapointsDf[column].dtype == "category":
+            datapointsDf[column] = datapointsDf[column].astype(datapointsDf[column].cat.categories.dtype)
+    return datapointsDf
+
 def support_labels(ax, start_pos, mid_pos, end_pos, label, circle_pos, color='gray', linewidth=3, fontsize=18):
     """
     Draw two line segments (like a 'powerpoint' arrow) and place a text label.
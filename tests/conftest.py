@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The scripts import utils/ from src/ and each other from src/Zotero_data_processing/
+srcDir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(srcDir))
+sys.path.insert(0, str(srcDir / "Zotero_data_processing"))
@@ -0,0 +1,95 @@
+import pytest
+
+from chunked_store import ChunkedStore
+from create_articles_df import build_articles_df, extract_article_data, fetch_articles_data_streaming, sync_articles_since
+
+COLLECTION_KEY = "PEWYQYGG"
+
+
+def make_item(key: str, citationKey: str, collections: list[str], tags: list[str] = ()) -> dict:
+    data = {
+        "key": key,
+        "version": 1,
+        "itemType": "journalArticle",
+        "title": f"Title of {citationKey}",
+        "citationKey": citationKey,
+        "date": "2024",
+        "collections": collections,
+        "creators": [],
+        "tags": [{"tag": tag} for tag in tags],
+    }
+    return {"key": key, "version": 1, "data": data}
+
+
+class FakeZoteroAPI:
+    """Stand-in for the pyzotero client, with the items modified and deleted since the synced version."""
+
+    def __init__(self, modifiedItems: list[dict], deletedKeys: list[str]):
+        self.modifiedItems = modifiedItems
+        self.deletedKeys = deletedKeys
+
+    def add_parameters(self, **params):
+        pass
+
+    def items(self):
+        return self.modifiedItems
+
+    def everything(self, items):
+        return items
+
+    def deleted(self, since):
+        return {"items": self.deletedKeys}
+
+
+class FakeItemsAPI:
+    """Stand-in for the pyzotero client, returning the requested items ("itemKey") among the given ones."""
+
+    def __init__(self, items: list[dict]):
+        self.itemsByKey = {item["key"]: item for item in items}
+
+    def items(self, itemKey: str, limit: int):
+        return [self.itemsByKey[key] for key in itemKey.split(",") if key in self.itemsByKey][:limit]
+
+
+def make_articles_df():
+    return build_articles_df([
+        extract_article_data(make_item("AAAA", "alpha2024", [COLLECTION_KEY])["data"]),
+        extract_article_data(make_item("BBBB", "beta2024", [COLLECTION_KEY])["data"]),
+    ])
+
+
+def test_build_articles_df_without_articles():
+    df = build_articles_df([])
+    assert df.empty
+    assert df.index.name == "BBT Citation Key"
+    assert list(df.columns) == list(make_articles_df().columns)
+
+
+def test_sync_deletion_only():
+    articlesDf = make_articles_df()
+    synced, exclusionCriteria = sync_articles_since(FakeZoteroAPI([], ["AAAA"]), COLLECTION_KEY, articlesDf, 10)
+    assert list(synced.index) == ["beta2024"]
+    assert list(synced.columns) == list(articlesDf.columns)
+    assert exclusionCriteria.total == 0
+
+
+def test_sync_item_outside_of_the_collection():
+    articlesDf = make_articles_df()
+    outsideItem = make_item("ZZZZ", "other2024", ["OTHERCOL"])
+    synced, _ = sync_articles_since(FakeZoteroAPI([outsideItem], []), COLLECTION_KEY, articlesDf, 10)
+    assert synced.equals(articlesDf)
+
+
+def test_fetch_streaming_missing_keys(tmp_path):
+    items = [make_item(f"K{i:03d}", f"article{i}", [COLLECTION_KEY]) for i in range(5)]
+    # K003 was deleted between the listing and the fetch
+    zoteroAPI = FakeItemsAPI(items[:3] + items[4:])
+    keys = [item["key"] for item in items]
+
+    with pytest.raises(ValueError, match=r"1 items were not returned by the Zotero API: \['K003'\]"):
+        fetch_articles_data_streaming(zoteroAPI, keys, tmp_path, chunkSize=2)
+    # The first chunk was written, a new run resumes from it
+    assert ChunkedStore(tmp_path).completed_keys() == {"K000", "K001"}
+
+    store = fetch_articles_data_streaming(zoteroAPI, keys[:3] + keys[4:], tmp_path, chunkSize=2)
+    assert list(store.load("Zotero Key", keys)["Zotero Key"]) == ["K000", "K001", "K002", "K004"]
@@ -0,0 +1,79 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from create_datapoints_df import diagnostics, extract_datapoints_incremental, extract_datapoints_parallel, extract_datapoints_sequential
+from datapoints_cache import CachedArticle, DatapointsCache
+from utils.dataframes import load_dataframe
+
+ARTICLES_PATH = Path(__file__).parent.parent / "data" / "Dataframes" / "all_articles.pkl"
+
+
+def load_articles_with_failure():
+    """A few articles of all_articles.pkl, and one without any model tag, whose extraction fails."""
+    articlesDf = load_dataframe(ARTICLES_PATH, columns=["Tags", "Date"]).iloc[:6]
+    failingArticle = pd.DataFrame({"Tags": [["Foo: bar"]], "Date": ["2020"]}, index=pd.Index(["noModel2020"], name=articlesDf.index.name))
+    return pd.concat([articlesDf.iloc[:3], failingArticle, articlesDf.iloc[3:]])
+
+
+def test_incremental_extraction_caches_failed_articles(tmp_path):
+    articlesDf = load_articles_with_failure()
+    expectedModels, expectedNbArticles, expectedErrors = extract_datapoints_parallel(articlesDf, 2)
+
+    with DatapointsCache(tmp_path / "datapoints.sqlite") as cache:
+        firstRun = extract_datapoints_incremental(articlesDf, cache, nbJobs=2)
+        assert (cache.hits, cache.misses) == (0, len(articlesDf))
+        # The failed article is cached too, with its error and no datapoints
+        assert len(cache) == len(articlesDf)
+
+    with DatapointsCache(tmp_path / "datapoints.sqlite") as cache:
+        secondRun = extract_datapoints_incremental(articlesDf, cache, nbJobs=2)
+        assert (cache.hits, cache.misses) == (len(articlesDf), 0)
+
+    for listOfModelsFromArticle, nbArticlesProcessed, errors in (firstRun, secondRun):
+        assert listOfModelsFromArticle == expectedModels
+        assert nbArticlesProcessed == expectedNbArticles == len(articlesDf) - 1
+        assert errors == expectedErrors
+        assert [errorRecord["BBT Citation Key"] for errorRecord in errors] == ["noModel2020"]
+
+
+def test_cache_round_trip(tmp_path):
+    with DatapointsCache(tmp_path / "datapoints.sqlite") as cache:
+        cache.put({
+            "a2020": ("hashA", CachedArticle([{"Model": "LeNet", "Latency": "1 ms"}])),
+            "b2021": ("hashB", CachedArticle([], {"BBT Citation Key": "b2021", "Error": "ValueError", "Message": "No model."})),
+        })
+        assert cache.get("a2020", "hashA") == CachedArticle([{"Model": "LeNet", "Latency": "1 ms"}], None)
+        assert cache.get("b2021", "hashB").error["Error"] == "ValueError"
+        assert cache.get("a2020", "otherHash") is None
+        assert cache.keep_only(["b2021"]) == 1
+
+
+def test_cache_of_a_previous_version_is_emptied(tmp_path):
+    path = tmp_path / "datapoints.sqlite"
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE articles (citationKey TEXT PRIMARY KEY, contentHash TEXT NOT NULL, datapoints TEXT NOT NULL)")
+        connection.execute("INSERT INTO articles VALUES ('a2020', 'hashA', '[]')")
+
+    with DatapointsCache(path) as cache:
+        assert len(cache) == 0
+        assert cache.get("a2020", "hashA") is None
+
+
+def test_incremental_extraction_replays_warnings(tmp_path):
+    articlesDf = load_dataframe(ARTICLES_PATH, columns=["Tags", "Date"])
+    diagnostics.pop_events()
+    expectedModels, _ = extract_datapoints_sequential(articlesDf)
+    expectedEvents = diagnostics.pop_events()
+    assert expectedEvents
+
+    # A cold run, a warm run, and a run where a single article changed
+    changedDf = articlesDf.copy()
+    changedDf.iloc[5, changedDf.columns.get_loc("Tags")] = list(changedDf.iloc[5]["Tags"]) + ["Note: changed"]
+    for df in (articlesDf, articlesDf, changedDf):
+        with DatapointsCache(tmp_path / "datapoints.sqlite") as cache:
+            listOfModelsFromArticle, _, _ = extract_datapoints_incremental(df, cache)
+        assert listOfModelsFromArticle == expectedModels
+        assert diagnostics.pop_events() == expectedEvents
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from utils.metadata import FpgaPartCatalog
+
+PART_COLUMNS = ["FPGA part", "FPGA year", "FPGA DSP", "FPGA family"]
+
+
+def make_datapoints():
+    boards = ["Zynq 7000 (XC7Z020) {PYNQ-Z1}", "Artix 7 (XC7A35T) {Arty}", "Zynq 7000 (XC7Z020) {PYNQ-Z1}", "Unknown (XCNONE) {Board}"]
+    return pd.DataFrame({"Board": pd.Categorical(boards), "Accuracy": [0.9, 0.8, 0.7, 0.6]}, index=[10, 11, 12, 13])
+
+
+def test_add_part_columns():
+    catalog = FpgaPartCatalog({"XC7Z020": [2011, 220, "Zynq"], "XC7A35T": [2010, 90, "Artix"]})
+    df = make_datapoints()
+    out = catalog.add_part_columns(df)
+
+    assert list(out.columns) == list(df.columns) + PART_COLUMNS
+    assert out.index.equals(df.index)
+    assert out["Board"].dtype == df["Board"].dtype
+    assert list(out["FPGA part"]) == ["XC7Z020", "XC7A35T", "XC7Z020", "XCNONE"]
+    assert list(out["FPGA DSP"].iloc[:3]) == [220, 90, 220]
+    assert out[["FPGA year", "FPGA DSP", "FPGA family"]].iloc[3].isna().all()
+    # The input is not modified
+    assert list(df.columns) == ["Board", "Accuracy"]
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pandas as pd
+
+from chunked_store import ChunkedStore
+from create_datapoints_df import diagnostics, extract_datapoints_sequential, extract_datapoints_streaming, iter_article_records, load_datapoints_chunks
+from utils.dataframes import load_dataframe
+
+ARTICLES_PATH = Path(__file__).parent.parent / "data" / "Dataframes" / "all_articles.pkl"
+
+
+def test_resumed_streaming_extraction(tmp_path):
+    articlesDf = load_dataframe(ARTICLES_PATH, columns=["Tags", "Date"])
+    diagnostics.pop_events()
+    listOfModelsFromArticle, _ = extract_datapoints_sequential(articlesDf)
+    expectedDf = pd.DataFrame(listOfModelsFromArticle)
+    expectedEvents = diagnostics.pop_events()
+
+    # A first run stopped after 20 articles, then resumed with all of them: the warnings of the stored articles are recorded again
+    extract_datapoints_streaming(iter_article_records(articlesDf.iloc[:20]), ChunkedStore(tmp_path), chunkSize=10)
+    diagnostics.pop_events()
+    store, citationKeys = extract_datapoints_streaming(iter_article_records(articlesDf), ChunkedStore(tmp_path), chunkSize=10)
+
+    assert citationKeys == list(articlesDf.index)
+    assert load_datapoints_chunks(store, citationKeys).equals(expectedDf)
+    assert pd.concat(list(store.iter_chunks())).reset_index(drop=True).equals(expectedDf)
+    assert diagnostics.pop_events() == expectedEvents
+    # Each chunk holds the warnings of its own articles
+    for chunk in ChunkedStore(tmp_path).chunks:
+        assert {event[1] for event in chunk["events"]} <= set(chunk["keys"])
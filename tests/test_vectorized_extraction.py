@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pandas as pd
+
+from create_datapoints_df import diagnostics, extract_datapoints_sequential
+from utils.dataframes import load_dataframe
+from vectorized_extraction import extract_datapoints_vectorized
+
+ARTICLES_PATH = Path(__file__).parent.parent / "data" / "Dataframes" / "all_articles.pkl"
+
+
+def test_vectorized_extraction_matches_sequential():
+    articlesDf = load_dataframe(ARTICLES_PATH, columns=["Tags", "Date"])
+
+    diagnostics.pop_events()
+    listOfModelsFromArticle, sequentialNbArticles = extract_datapoints_sequential(articlesDf)
+    sequentialDf = pd.DataFrame(listOfModelsFromArticle)
+    sequentialEvents = diagnostics.pop_events()
+
+    vectorizedDf, vectorizedNbArticles, vectorizedEvents = extract_datapoints_vectorized(articlesDf)
+
+    assert len(sequentialDf) > 0
+    pd.testing.assert_frame_equal(vectorizedDf, sequentialDf)
+    assert vectorizedDf.equals(sequentialDf)
+    assert vectorizedNbArticles == sequentialNbArticles
+    assert vectorizedEvents == sequentialEvents
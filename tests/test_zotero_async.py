@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from zotero_async import AsyncZoteroFetcher, ListingConsistencyError, check_listing_consistency
+
+LIBRARY_VERSION = 42
+COLLECTION_KEY = "COLL1234"
+ITEMS = [{"key": f"K{i:04d}", "version": 1, "data": {"key": f"K{i:04d}", "title": f"Article {i}"}} for i in range(250)]
+
+
+class StandInZoteroHandler(BaseHTTPRequestHandler):
+    """Local stand-in of the Zotero API: paged collection listing and "itemKey" batches of ITEMS.
+    The first request of the second listing page gets a 429 with "Retry-After", and the first listing page has a "Backoff" header."""
+
+    server: "StandInZoteroServer"
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        self.server.requests.append((url.path, params))
+        if url.path == f"/groups/1/collections/{COLLECTION_KEY}/items":
+            start, limit = int(params["start"]), int(params["limit"])
+            headers = {"Total-Results": str(len(ITEMS)), "Last-Modified-Version": str(LIBRARY_VERSION)}
+            with self.server.lock:
+                rateLimited = start == 100 and not self.server.rateLimited
+                self.server.rateLimited |= rateLimited
+            if rateLimited:
+                self.send_json({"error": "Too many requests"}, {"Retry-After": "0.2"}, status=429)
+                return
+            if start == 0:
+                headers["Backoff"] = "0.1"
+            self.send_json(ITEMS[start:start + limit], headers)
+        elif url.path == "/groups/1/items":
+            keys = params["itemKey"].split(",")
+            self.send_json([item for item in ITEMS if item["key"] in keys])
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+    def send_json(self, content, headers=None, status=200):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInZoteroServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInZoteroHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.rateLimited = False
+
+
+@pytest.fixture
+def server():
+    server = StandInZoteroServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(server):
+    host, port = server.server_address
+    return AsyncZoteroFetcher("1", "group", "secret", endpoint=f"http://{host}:{port}", concurrency=4, retryBaseDelay=0.01)
+
+
+def test_fetch_collection_items(server):
+    fetcher = make_fetcher(server)
+    items = asyncio.run(fetcher.fetch_collection_items(COLLECTION_KEY, {"itemType": "journalArticle"}))
+
+    assert items == ITEMS
+    # 3 pages, the second one requested twice because of the 429
+    assert fetcher.stats.nbRequests == 4
+    assert fetcher.stats.nbRetries == 1
+    assert fetcher.stats.nbItems == len(ITEMS)
+    # The "Backoff" of the first page and the "Retry-After" of the 429 paused the following requests
+    assert fetcher.stats.backoffTime > 0
+    assert sorted(int(params["start"]) for _, params in server.requests) == [0, 100, 100, 200]
+    assert all(params["itemType"] == "journalArticle" for _, params in server.requests)
+
+
+def test_fetch_items_data(server):
+    fetcher = make_fetcher(server)
+    keys = ["K0007", "K0003", "K0120", "K0004", "K0249"]
+    itemsData = asyncio.run(fetcher.fetch_items_data(keys, batchSize=2))
+
+    assert [data["key"] for data in itemsData] == keys
+    assert itemsData[0] == ITEMS[7]["data"]
+    assert sorted(params["itemKey"] for _, params in server.requests) == ["K0007,K0003", "K0120,K0004", "K0249"]
+    assert fetcher.stats.nbRetries == 0
+    assert fetcher.stats.nbItems == len(keys)
+
+
+def test_fetch_items_data_missing_keys(server):
+    fetcher = make_fetcher(server)
+    with pytest.raises(ValueError, match="1 items were not returned"):
+        asyncio.run(fetcher.fetch_items_data(["K0001", "DELETED1"]))
+
+
+def test_check_listing_consistency():
+    check_listing_consistency(ITEMS, len(ITEMS), [LIBRARY_VERSION] * 3)
+    with pytest.raises(ListingConsistencyError, match="versions"):
+        check_listing_consistency(ITEMS, len(ITEMS), [LIBRARY_VERSION, LIBRARY_VERSION + 1, LIBRARY_VERSION + 1])
+    # An item shifted from the second page to the first one while the first page was listed: listed twice, and another one missing
+    shiftedItems = ITEMS[:100] + ITEMS[99:249]
+    with pytest.raises(ListingConsistencyError, match="1 duplicated and 1 missing"):
+        check_listing_consistency(shiftedItems, len(ITEMS), [LIBRARY_VERSION] * 3)
@@ -0,0 +1,148 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from create_articles_df import articles_data_from_items
+from zotero_local_db import get_all_articles_in_local_collection, sqlite_date_to_api_date
+
+GROUP_ID = 5602981
+COLLECTION_KEY = "PEWYQYGG"
+ITEM_TYPES = ["conferencePaper", "journalArticle", "bookSection"]
+
+# Subset of the schema of zotero.sqlite used by get_all_articles_in_local_collection()
+# (itemTypesCombined and fieldsCombined are views over the built-in and custom types/fields in the real database)
+SCHEMA = """
+CREATE TABLE groups (groupID INTEGER PRIMARY KEY, libraryID INT NOT NULL UNIQUE);
+CREATE TABLE collections (collectionID INTEGER PRIMARY KEY, libraryID INT NOT NULL, key TEXT NOT NULL);
+CREATE TABLE collectionItems (collectionID INT NOT NULL, itemID INT NOT NULL, orderIndex INT NOT NULL DEFAULT 0);
+CREATE TABLE itemTypesCombined (itemTypeID INT NOT NULL, typeName TEXT NOT NULL);
+CREATE TABLE items (itemID INTEGER PRIMARY KEY, itemTypeID INT NOT NULL, libraryID INT NOT NULL, key TEXT NOT NULL, dateModified TEXT NOT NULL, version INT NOT NULL);
+CREATE TABLE deletedItems (itemID INTEGER PRIMARY KEY, dateDeleted TEXT);
+CREATE TABLE fieldsCombined (fieldID INT NOT NULL, fieldName TEXT NOT NULL);
+CREATE TABLE itemDataValues (valueID INTEGER PRIMARY KEY, value UNIQUE);
+CREATE TABLE itemData (itemID INT, fieldID INT, valueID INT);
+CREATE TABLE creatorTypes (creatorTypeID INTEGER PRIMARY KEY, creatorType TEXT);
+CREATE TABLE creators (creatorID INTEGER PRIMARY KEY, firstName TEXT, lastName TEXT, fieldMode INT);
+CREATE TABLE itemCreators (itemID INT NOT NULL, creatorID INT NOT NULL, creatorTypeID INT NOT NULL, orderIndex INT NOT NULL);
+CREATE TABLE tags (tagID INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE itemTags (itemID INT NOT NULL, tagID INT NOT NULL, type INT NOT NULL DEFAULT 0);
+"""
+ITEM_TYPE_IDS = {"conferencePaper": 11, "journalArticle": 22, "bookSection": 7, "note": 28, "attachment": 3}
+FIELD_IDS = {"title": 1, "abstractNote": 2, "date": 6, "url": 13, "extra": 16, "DOI": 59, "citationKey": 120, "volume": 19}
+CREATOR_TYPE_IDS = {"author": 8, "editor": 10}
+
+
+def make_api_item(key, itemType, title, date, tags, creators, citationKey="", extra="", doi="", version=10):
+    data = {
+        "key": key, "version": version, "itemType": itemType, "title": title, "creators": creators, "abstractNote": f"Abstract of {title}",
+        "date": date, "url": f"https://example.org/{key}", "extra": extra, "DOI": doi, "citationKey": citationKey, "tags": [{"tag": tag} for tag in tags],
+    }
+    return {"key": key, "version": version, "data": data}
+
+
+# Items of the collection, as returned by the web API (tags sorted by name like the local read)
+API_ITEMS = [
+    make_api_item(
+        "AAAA1111", "journalArticle", "Quantized CNN on FPGA", "2021-06", ["Board: Zynq 7000 (XC7Z020) {PYNQ-Z1}", "Model: LeNet"],
+        [{"creatorType": "author", "firstName": "Ada", "lastName": "Lovelace"}, {"creatorType": "author", "firstName": "Alan", "lastName": "Turing"}],
+        citationKey="lovelace2021", doi="10.1000/aaaa",
+    ),
+    make_api_item(
+        "BBBB2222", "conferencePaper", "Spiking networks", "March 3, 2023", ["Excluded: Not an FPGA"],
+        [{"creatorType": "author", "firstName": "Grace", "lastName": "Hopper"}, {"creatorType": "editor", "name": "IEEE"}],
+        extra="Citation Key: hopper2023\nPublisher: IEEE",
+    ),
+    make_api_item("CCCC3333", "bookSection", "Onboard inference", "", [], [], citationKey="noone2020", version=12),
+]
+
+
+def sql_date(apiDate: str) -> str:
+    # Zotero prefixes the parsed SQL date to the original string (with 00 for the unknown month or day)
+    if apiDate == "2021-06":
+        return "2021-06-00 2021-06"
+    if apiDate == "March 3, 2023":
+        return "2023-03-03 March 3, 2023"
+    return apiDate
+
+
+def insert_item(connection, itemID, libraryID, item, collectionIDs, dateModified):
+    data = item["data"]
+    connection.execute(
+        "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)", (itemID, ITEM_TYPE_IDS[data["itemType"]], libraryID, data["key"], dateModified, data["version"])
+    )
+    for collectionID in collectionIDs:
+        connection.execute("INSERT INTO collectionItems (collectionID, itemID) VALUES (?, ?)", (collectionID, itemID))
+    # Empty fields are not stored, the API returns them as ""
+    for field, value in data.items():
+        if field in FIELD_IDS and value:
+            value = sql_date(value) if field == "date" else value
+            connection.execute("INSERT OR IGNORE INTO itemDataValues (value) VALUES (?)", (value,))
+            valueID = connection.execute("SELECT valueID FROM itemDataValues WHERE value = ?", (value,)).fetchone()[0]
+            connection.execute("INSERT INTO itemData VALUES (?, ?, ?)", (itemID, FIELD_IDS[field], valueID))
+    for orderIndex, creator in enumerate(data["creators"]):
+        fieldMode = 1 if "name" in creator else 0
+        creatorID = connection.execute(
+            "INSERT INTO creators (firstName, lastName, fieldMode) VALUES (?, ?, ?)",
+            ("" if fieldMode else creator["firstName"], creator["name"] if fieldMode else creator["lastName"], fieldMode),
+        ).lastrowid
+        connection.execute("INSERT INTO itemCreators VALUES (?, ?, ?, ?)", (itemID, creatorID, CREATOR_TYPE_IDS[creator["creatorType"]], orderIndex))
+    # Inserted in reverse order, the tags are read back sorted by name
+    for tag in reversed(data["tags"]):
+        connection.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag["tag"],))
+        tagID = connection.execute("SELECT tagID FROM tags WHERE name = ?", (tag["tag"],)).fetchone()[0]
+        connection.execute("INSERT INTO itemTags (itemID, tagID) VALUES (?, ?)", (itemID, tagID))
+
+
+@pytest.fixture
+def zoteroDB(tmp_path):
+    """A small zotero.sqlite: API_ITEMS in the collection of the group library, plus items that must not be selected."""
+    dbPath = tmp_path / "zotero.sqlite"
+    with closing(sqlite3.connect(dbPath)) as connection, connection:
+        connection.executescript(SCHEMA)
+        connection.executemany("INSERT INTO itemTypesCombined VALUES (?, ?)", [(typeID, name) for name, typeID in ITEM_TYPE_IDS.items()])
+        connection.executemany("INSERT INTO fieldsCombined VALUES (?, ?)", [(fieldID, name) for name, fieldID in FIELD_IDS.items()])
+        connection.executemany("INSERT INTO creatorTypes VALUES (?, ?)", [(typeID, name) for name, typeID in CREATOR_TYPE_IDS.items()])
+        # Library 1 is the user library, library 2 is the group, library 3 another group with a collection of the same key
+        connection.executemany("INSERT INTO groups VALUES (?, ?)", [(GROUP_ID, 2), (1234, 3)])
+        connection.executemany("INSERT INTO collections VALUES (?, ?, ?)", [(1, 2, COLLECTION_KEY), (2, 2, "OTHERCOL"), (3, 3, COLLECTION_KEY)])
+
+        for itemID, item in enumerate(API_ITEMS, start=1):
+            insert_item(connection, itemID, 2, item, [1], f"2024-01-0{itemID} 10:00:00")
+        # In the trash
+        insert_item(connection, 10, 2, make_api_item("TRASH000", "journalArticle", "Deleted", "2020", [], []), [1], "2024-02-01 10:00:00")
+        connection.execute("INSERT INTO deletedItems (itemID) VALUES (10)")
+        # Not an article
+        insert_item(connection, 11, 2, make_api_item("NOTE0000", "note", "", "", [], []), [1], "2024-02-01 10:00:00")
+        # In another collection of the library
+        insert_item(connection, 12, 2, make_api_item("OTHER000", "journalArticle", "Other", "2020", [], []), [2], "2024-02-01 10:00:00")
+        # In the collection with the same key of the other group
+        insert_item(connection, 13, 3, make_api_item("GROUP000", "journalArticle", "Other group", "2020", [], []), [3], "2024-02-01 10:00:00")
+    return dbPath
+
+
+def test_local_collection_matches_api_items(zoteroDB):
+    localItems = get_all_articles_in_local_collection(zoteroDB, COLLECTION_KEY, ITEM_TYPES, GROUP_ID)
+
+    # Most recently modified first, like the web API listing
+    assert [item["key"] for item in localItems] == ["CCCC3333", "BBBB2222", "AAAA1111"]
+    keys = [item["key"] for item in API_ITEMS]
+    localDf = articles_data_from_items(localItems, keys)
+    apiDf = articles_data_from_items(API_ITEMS, keys)
+    assert localDf.equals(apiDf)
+    assert list(localDf.index) == ["lovelace2021", "hopper2023", "noone2020"]
+    assert list(localDf["Date"]) == ["2021-06", "March 3, 2023", ""]
+    assert localItems[1]["data"]["creators"][1] == {"creatorType": "editor", "name": "IEEE"}
+
+
+def test_local_collection_of_any_library(zoteroDB):
+    # Without groupID, the collections with the same key in all the libraries are read
+    localItems = get_all_articles_in_local_collection(zoteroDB, COLLECTION_KEY, ITEM_TYPES)
+    assert sorted(item["key"] for item in localItems) == ["AAAA1111", "BBBB2222", "CCCC3333", "GROUP000"]
+
+
+def test_sqlite_date_to_api_date():
+    assert sqlite_date_to_api_date("2021-06-00 2021-06") == "2021-06"
+    assert sqlite_date_to_api_date("2023-03-03 March 3, 2023") == "March 3, 2023"
+    assert sqlite_date_to_api_date("2021") == "2021"
+    assert sqlite_date_to_api_date("") == ""